@@ -65,7 +65,8 @@ class DatabaseManager:
                 else:
                     cursor.execute(query)
                 
-                if query.strip().upper().startswith('SELECT') and fetch:
+                # Запросы с CTE (WITH ... SELECT) тоже возвращают строки
+                if query.strip().upper().startswith(('SELECT', 'WITH')) and fetch:
                     return cursor.fetchall()
                 else:
                     conn.commit()
@@ -225,11 +226,23 @@ class DatabaseManager:
                 sent_at TIMESTAMP,
                 delivered_at TIMESTAMP,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_month TEXT GENERATED ALWAYS AS (strftime('%Y-%m', created_at)) VIRTUAL,
                 FOREIGN KEY (campaign_id) REFERENCES sms_campaigns(id) ON DELETE CASCADE,
                 FOREIGN KEY (citizen_id) REFERENCES citizens(id) ON DELETE SET NULL
             )
         """, fetch=False)
         
+        # Месяц отправки для помесячной статистики (в базах, созданных до появления колонки)
+        month_column = self.execute_query(
+            "SELECT name FROM pragma_table_xinfo('sms_logs') WHERE name = 'created_month'"
+        )
+        if not month_column:
+            self.execute_query(
+                "ALTER TABLE sms_logs ADD COLUMN created_month TEXT "
+                "GENERATED ALWAYS AS (strftime('%Y-%m', created_at)) VIRTUAL",
+                fetch=False
+            )
+        
         # Экстренные SMS
         self.execute_query("""
             CREATE TABLE IF NOT EXISTS emergency_sms (
@@ -306,18 +319,54 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_citizens_name ON citizens(full_name)",
             "CREATE INDEX IF NOT EXISTS idx_citizens_phone ON citizens(phone)",
             "CREATE INDEX IF NOT EXISTS idx_citizens_active ON citizens(is_active)",
-            "CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings(meeting_date)",
+            # Счетчики новых граждан за период на дашборде
+            "CREATE INDEX IF NOT EXISTS idx_citizens_created_active ON citizens(created_at, is_active)",
+            # Частичный индекс для сумм и счетчиков баллов активных граждан
+            "CREATE INDEX IF NOT EXISTS idx_citizens_active_points ON citizens(total_points) WHERE is_active = 1",
             "CREATE INDEX IF NOT EXISTS idx_meetings_status ON meetings(status)",
+            # Отчет по заседаниям: диапазон дат + фильтр статуса, сортировка по дате
+            "CREATE INDEX IF NOT EXISTS idx_meetings_date_status ON meetings(meeting_date DESC, status)",
             "CREATE INDEX IF NOT EXISTS idx_attendance_citizen ON attendance(citizen_id)",
             "CREATE INDEX IF NOT EXISTS idx_attendance_meeting ON attendance(meeting_id)",
-            "CREATE INDEX IF NOT EXISTS idx_sms_logs_campaign ON sms_logs(campaign_id)",
+            # Журнал отправки кампании: фильтр по кампании, сортировка по времени
+            "CREATE INDEX IF NOT EXISTS idx_sms_logs_campaign_created ON sms_logs(campaign_id, created_at DESC)",
+            # Журнал кампании с фильтром по статусу: поиск и сортировка по одному индексу
+            "CREATE INDEX IF NOT EXISTS idx_sms_logs_campaign_status ON sms_logs(campaign_id, status, created_at DESC)",
+            # Покрывающий индекс для счетчиков доставки по статусам
+            "CREATE INDEX IF NOT EXISTS idx_sms_logs_status ON sms_logs(status)",
             "CREATE INDEX IF NOT EXISTS idx_sms_logs_citizen ON sms_logs(citizen_id)",
+            # Помесячная статистика SMS по генерируемой колонке created_month
+            "CREATE INDEX IF NOT EXISTS idx_sms_logs_month ON sms_logs(created_month)",
+            # Отчет по SMS и дашборд фильтруют кампании по дате создания
+            "CREATE INDEX IF NOT EXISTS idx_sms_campaigns_created ON sms_campaigns(created_at)",
+            # Список кампаний: фильтр по типу + период, сортировка по дате создания
+            "CREATE INDEX IF NOT EXISTS idx_sms_campaigns_type_created ON sms_campaigns(campaign_type, created_at DESC)",
             "CREATE INDEX IF NOT EXISTS idx_points_citizen ON citizen_points(citizen_id)",
-            "CREATE INDEX IF NOT EXISTS idx_points_date ON citizen_points(date_earned)"
+            # Покрывающий индекс для агрегатов по дням: SUM(points) без чтения строк таблицы
+            "CREATE INDEX IF NOT EXISTS idx_points_date_points ON citizen_points(date_earned, points)"
         ]
         
+        indexes_before = self._get_index_names()
+        
         for index_sql in indexes:
             self.execute_query(index_sql, fetch=False)
+        
+        # Одиночные индексы перекрыты составными с тем же префиксом
+        # (idx_meetings_date_status, idx_points_date_points, idx_sms_logs_campaign_created)
+        # и только замедляют запись
+        for index_name in ("idx_meetings_date", "idx_points_date", "idx_sms_logs_campaign"):
+            if index_name in indexes_before:
+                self.execute_query(f"DROP INDEX IF EXISTS {index_name}", fetch=False)
+        
+        # Статистику обновляем только при изменении набора индексов:
+        # полный ANALYZE читает все таблицы и индексы
+        if self._get_index_names() != indexes_before:
+            self.execute_query("ANALYZE", fetch=False)
+    
+    def _get_index_names(self) -> set:
+        """Имена существующих индексов БД"""
+        rows = self.execute_query("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row['name'] for row in rows or []}
     
     def _insert_initial_data(self):
         """Вставка начальных данных"""
@@ -439,6 +488,20 @@ class DatabaseManager:
         # Количество записей в таблицах
         tables = ['citizens', 'meetings', 'attendance', 'sms_campaigns', 'sms_logs', 'citizen_points']
         
+        # Все подсчеты одним запросом
+        counts_query = "SELECT " + ", ".join(
+            f"(SELECT COUNT(*) FROM {table}) as {table}_count" for table in tables
+        )
+        
+        result = self.execute_query(counts_query)
+        
+        if result:
+            for table in tables:
+                info[f'{table}_count'] = result[0][f'{table}_count']
+            return info
+        
+        # Общий запрос не выполнился (например, нет одной из таблиц):
+        # считаем каждую таблицу отдельно
         for table in tables:
             try:
                 result = self.execute_query(f"SELECT COUNT(*) as count FROM {table}")
@@ -446,4 +509,79 @@ class DatabaseManager:
             except:
                 info[f'{table}_count'] = 0
         
-        return info
\ No newline at end of file
+        return info
+    
+    def get_dashboard_counts(self) -> Dict[str, int]:
+        """
+        Получение счетчиков для сводной панели отчетов
+        
+        Каждая таблица читается один раз, подытоги считаются
+        условной агрегацией; все счетчики возвращаются одним запросом.
+        
+        Returns:
+            Словарь со счетчиками
+        """
+        query = """
+            SELECT * FROM
+                (
+                    SELECT 
+                        COALESCE(SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END), 0) as active_citizens,
+                        COALESCE(SUM(CASE WHEN is_active = 1 AND created_at >= date('now', '-30 days') THEN 1 ELSE 0 END), 0) as new_citizens_30d
+                    FROM citizens
+                ),
+                (
+                    SELECT 
+                        COUNT(*) as total_meetings,
+                        COALESCE(SUM(CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END), 0) as completed_meetings
+                    FROM meetings
+                ),
+                (
+                    SELECT 
+                        COUNT(*) as total_points_records,
+                        COALESCE(SUM(CASE WHEN date_earned >= date('now', '-30 days') THEN 1 ELSE 0 END), 0) as points_records_30d
+                    FROM citizen_points
+                ),
+                (
+                    SELECT 
+                        COUNT(*) as total_sms_campaigns,
+                        COALESCE(SUM(CASE WHEN created_at >= date('now', '-30 days') THEN 1 ELSE 0 END), 0) as sms_campaigns_30d
+                    FROM sms_campaigns
+                )
+        """
+        
+        result = self.execute_query(query)
+        return dict(result[0]) if result else {}
+    
+    def get_period_counts(self, start_date: str) -> Dict[str, int]:
+        """
+        Получение ключевых счетчиков системы за период одним запросом
+        
+        Args:
+            start_date: Начало периода (ISO-дата)
+            
+        Returns:
+            Словарь со счетчиками: total_citizens, new_citizens, citizens_with_points,
+            total_meetings, completed_meetings, points_records, sms_campaigns
+        """
+        query = """
+            SELECT * FROM
+                (
+                    SELECT 
+                        COALESCE(SUM(CASE WHEN is_active = 1 THEN 1 ELSE 0 END), 0) as total_citizens,
+                        COALESCE(SUM(CASE WHEN is_active = 1 AND created_at >= ? THEN 1 ELSE 0 END), 0) as new_citizens,
+                        COALESCE(SUM(CASE WHEN is_active = 1 AND total_points > 0 THEN 1 ELSE 0 END), 0) as citizens_with_points
+                    FROM citizens
+                ),
+                (
+                    SELECT 
+                        COUNT(*) as total_meetings,
+                        COALESCE(SUM(CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END), 0) as completed_meetings
+                    FROM meetings
+                    WHERE meeting_date >= ?
+                ),
+                (SELECT COUNT(*) as points_records FROM citizen_points WHERE date_earned >= ?),
+                (SELECT COUNT(*) as sms_campaigns FROM sms_campaigns WHERE created_at >= ?)
+        """
+        
+        result = self.execute_query(query, (start_date,) * 4)
+        return dict(result[0]) if result else {}
@@ -31,6 +31,8 @@ class AppSettings:
     SMS_PROVIDER = "demo"  # demo, eskiz, ucell
     SMS_MAX_LENGTH = 160
     SMS_RATE_LIMIT_PER_MINUTE = 60
+    SMS_BATCH_SIZE = 500  # Записей журнала SMS на одну транзакцию
+    SMS_SEND_WORKERS = 16  # Параллельных вызовов шлюза провайдера
     
     # Система баллов
     POINTS_CONFIG = {
@@ -79,7 +81,9 @@ class AppSettings:
         return {
             'provider': cls.SMS_PROVIDER,
             'max_length': cls.SMS_MAX_LENGTH,
-            'rate_limit': cls.SMS_RATE_LIMIT_PER_MINUTE
+            'rate_limit': cls.SMS_RATE_LIMIT_PER_MINUTE,
+            'batch_size': cls.SMS_BATCH_SIZE,
+            'send_workers': cls.SMS_SEND_WORKERS
         }
 
 # Глобальный экземпляр настроек
@@ -32,16 +32,15 @@ def safe_import():
     try:
         # Основные конфигурационные модули
         from config.settings import get_settings, PAGES_CONFIG
-        from config.database import DatabaseManager
         
         # Утилиты
         from utils.auth import check_authentication, show_user_info, logout, session_timeout_warning
-        from utils.helpers import set_page_config, apply_custom_css
+        from utils.helpers import set_page_config, apply_custom_css, get_database_manager
         
         return {
             'get_settings': get_settings,
             'PAGES_CONFIG': PAGES_CONFIG,
-            'DatabaseManager': DatabaseManager,
+            'get_database_manager': get_database_manager,
             'check_authentication': check_authentication,
             'show_user_info': show_user_info,
             'logout': logout,
@@ -199,9 +198,9 @@ def show_system_status(imports):
     st.sidebar.markdown("### 🔧 Статус системы")
     
     try:
-        DatabaseManager = imports.get('DatabaseManager')
-        if DatabaseManager:
-            db = DatabaseManager()
+        get_database_manager = imports.get('get_database_manager')
+        if get_database_manager:
+            db = get_database_manager()
             db_info = db.get_database_info()
             
             # Информация о базе данных
@@ -61,7 +61,13 @@ class BaseModel:
         result = self.db.execute_query(query, (record_id,))
         return result[0] if result else None
     
-    def get_all(self, where_clause: str = "", params: tuple = None, order_by: str = "id") -> List[sqlite3.Row]:
+    def get_all(
+        self, 
+        where_clause: str = "", 
+        params: tuple = None, 
+        order_by: str = "id",
+        limit: Optional[int] = None
+    ) -> List[sqlite3.Row]:
         """
         Получение всех записей
         
@@ -69,6 +75,7 @@ class BaseModel:
             where_clause: Условие WHERE (без слова WHERE)
             params: Параметры для условия
             order_by: Поле для сортировки
+            limit: Максимальное количество записей (None - без ограничения)
             
         Returns:
             Список записей
@@ -80,6 +87,10 @@ class BaseModel:
         
         query += f" ORDER BY {order_by}"
         
+        if limit is not None:
+            query += " LIMIT ?"
+            params = tuple(params or ()) + (limit,)
+        
         result = self.db.execute_query(query, params)
         return result if result else []
     
@@ -170,7 +181,8 @@ class BaseModel:
         page_size: int = 50, 
         where_clause: str = "", 
         params: tuple = None,
-        order_by: str = "id"
+        order_by: str = "id",
+        columns: str = "*"
     ) -> Dict[str, Any]:
         """
         Получение записей с пагинацией
@@ -181,6 +193,7 @@ class BaseModel:
             where_clause: Условие WHERE
             params: Параметры для условия
             order_by: Поле для сортировки
+            columns: Список выбираемых колонок и выражений
             
         Returns:
             Словарь с данными и метаинформацией
@@ -192,7 +205,7 @@ class BaseModel:
         offset = (page - 1) * page_size
         
         # Запрос с LIMIT и OFFSET
-        query = f"SELECT * FROM {self.table_name}"
+        query = f"SELECT {columns} FROM {self.table_name}"
         
         if where_clause:
             query += f" WHERE {where_clause}"
@@ -174,14 +174,77 @@ class CitizenModel(BaseModel):
         """
         return self.search(search_term, self.search_fields)
     
-    def get_active_citizens(self) -> List[sqlite3.Row]:
-        """Получение списка активных граждан"""
-        return self.get_all("is_active = 1", order_by="full_name")
+    def get_active_citizens(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        birth_date_not_null: bool = False,
+        every_nth: int = 1
+    ) -> List[sqlite3.Row]:
+        """
+        Получение списка активных граждан (по алфавиту)
+        
+        Args:
+            limit: Ограничение количества записей
+            offset: Смещение от начала списка
+            birth_date_not_null: Только граждане с указанной датой рождения
+            every_nth: Брать каждого n-го гражданина списка, начиная с первого
+            
+        Returns:
+            Список записей граждан
+        """
+        if limit is None and not offset and not birth_date_not_null and every_nth <= 1:
+            return self.get_all("is_active = 1", order_by="full_name")
+        
+        where_clause = "is_active = 1"
+        if birth_date_not_null:
+            where_clause += " AND birth_date IS NOT NULL"
+        
+        params = []
+        
+        if every_nth > 1:
+            # Прореживание выполняется в SQLite по номеру строки в алфавитном порядке
+            query = f"""
+                SELECT * FROM (
+                    SELECT *, ROW_NUMBER() OVER (ORDER BY full_name) as row_num
+                    FROM {self.table_name}
+                    WHERE {where_clause}
+                )
+                WHERE (row_num - 1) % ? = 0
+                ORDER BY row_num
+            """
+            params.append(every_nth)
+        else:
+            query = f"SELECT * FROM {self.table_name} WHERE {where_clause} ORDER BY full_name"
+        
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit if limit is not None else -1, offset])
+        
+        result = self.db.execute_query(query, tuple(params))
+        return result if result else []
     
     def get_citizens_with_phones(self) -> List[sqlite3.Row]:
         """Получение граждан с указанными номерами телефонов"""
         return self.get_all("is_active = 1 AND phone IS NOT NULL AND phone != ''", order_by="full_name")
     
+    def get_sms_recipients(self) -> List[Dict[str, Any]]:
+        """
+        Получатели SMS: активные граждане с номером телефона
+        
+        Returns:
+            Список словарей (citizen_id, phone, full_name) по алфавиту
+        """
+        query = f"""
+            SELECT id as citizen_id, phone, full_name
+            FROM {self.table_name}
+            WHERE is_active = 1 AND phone IS NOT NULL AND phone != ''
+            ORDER BY full_name
+        """
+        
+        result = self.db.execute_query(query)
+        return [dict(row) for row in result] if result else []
+    
     def get_citizen_by_phone(self, phone: str) -> Optional[sqlite3.Row]:
         """
         Поиск гражданина по номеру телефона
@@ -199,12 +199,12 @@ class MeetingModel(BaseModel):
         query = """
             SELECT * FROM meetings 
             WHERE meeting_date >= date('now') 
-            AND meeting_date <= date('now', '+{} days')
+            AND meeting_date <= date('now', ?)
             AND status = 'PLANNED'
             ORDER BY meeting_date, meeting_time
-        """.format(days_ahead)
+        """
         
-        result = self.db.execute_query(query)
+        result = self.db.execute_query(query, (f'+{days_ahead} days',))
         return result if result else []
     
     def get_past_meetings(self, days_back: int = 90) -> List[sqlite3.Row]:
@@ -220,11 +220,11 @@ class MeetingModel(BaseModel):
         query = """
             SELECT * FROM meetings 
             WHERE meeting_date < date('now') 
-            AND meeting_date >= date('now', '-{} days')
+            AND meeting_date >= date('now', ?)
             ORDER BY meeting_date DESC, meeting_time DESC
-        """.format(days_back)
+        """
         
-        result = self.db.execute_query(query)
+        result = self.db.execute_query(query, (f'-{days_back} days',))
         return result if result else []
     
     def get_meetings_by_status(self, status: str) -> List[sqlite3.Row]:
@@ -320,6 +320,33 @@ class MeetingModel(BaseModel):
         
         return (meeting['attendance_count'] / meeting['total_invited']) * 100
     
+    def get_attendance_trend(self, days_back: int = 180) -> List[sqlite3.Row]:
+        """
+        Средняя посещаемость проведенных заседаний по дням (агрегация в SQL)
+        
+        Args:
+            days_back: Количество дней назад
+            
+        Returns:
+            Строки (date, attendance_rate, meetings_count), отсортированные по дате
+        """
+        query = """
+            SELECT 
+                date(meeting_date) as date,
+                AVG(CASE WHEN total_invited > 0 
+                         THEN attendance_count * 100.0 / total_invited 
+                         ELSE 0 END) as attendance_rate,
+                COUNT(*) as meetings_count
+            FROM meetings 
+            WHERE status = 'COMPLETED' 
+            AND meeting_date >= date('now', ?)
+            GROUP BY date(meeting_date)
+            ORDER BY date
+        """
+        
+        result = self.db.execute_query(query, (f'-{days_back} days',))
+        return result if result else []
+    
     def get_monthly_statistics(self, year: int, month: int) -> Dict[str, Any]:
         """
         Получение статистики заседаний за месяц
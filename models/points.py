@@ -222,7 +222,9 @@ class PointsModel(BaseModel):
     def get_citizen_points_history(
         self, 
         citizen_id: int, 
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        activity_type: Optional[str] = None,
+        since: Optional[datetime] = None
     ) -> List[sqlite3.Row]:
         """
         Получение истории начислений баллов гражданина
@@ -230,6 +232,8 @@ class PointsModel(BaseModel):
         Args:
             citizen_id: ID гражданина
             limit: Ограничение количества записей
+            activity_type: Фильтр по типу активности
+            since: Только начисления, созданные не раньше этого момента
             
         Returns:
             Список записей истории
@@ -243,18 +247,48 @@ class PointsModel(BaseModel):
             LEFT JOIN meetings m ON cp.meeting_id = m.id
             LEFT JOIN users u ON cp.created_by = u.id
             WHERE cp.citizen_id = ?
-            ORDER BY cp.date_earned DESC, cp.created_at DESC
         """
         
-        params = (citizen_id,)
+        params = [citizen_id]
+        
+        if activity_type:
+            query += " AND cp.activity_type = ?"
+            params.append(activity_type)
+        
+        if since:
+            # datetime() приводит оба значения к одному формату (ISO с 'T' и CURRENT_TIMESTAMP)
+            query += " AND datetime(cp.created_at) >= datetime(?)"
+            params.append(since.isoformat())
+        
+        query += " ORDER BY cp.date_earned DESC, cp.created_at DESC"
         
         if limit:
             query += " LIMIT ?"
-            params = (citizen_id, limit)
+            params.append(limit)
         
-        result = self.db.execute_query(query, params)
+        result = self.db.execute_query(query, tuple(params))
         return result if result else []
     
+    def get_distinct_activity_types_for_citizen(self, citizen_id: int) -> List[str]:
+        """
+        Получение типов активности, по которым гражданину начислялись баллы
+        
+        Args:
+            citizen_id: ID гражданина
+            
+        Returns:
+            Отсортированный список типов активности
+        """
+        query = """
+            SELECT DISTINCT activity_type
+            FROM citizen_points
+            WHERE citizen_id = ?
+            ORDER BY activity_type
+        """
+        
+        result = self.db.execute_query(query, (citizen_id,))
+        return [row['activity_type'] for row in result] if result else []
+    
     def get_leaderboard(self, limit: int = 10, period_days: Optional[int] = None) -> List[sqlite3.Row]:
         """
         Получение рейтинга активных граждан
@@ -338,13 +372,12 @@ class PointsModel(BaseModel):
         activity_result = self.db.execute_query(activity_query, (start_date.isoformat(),))
         activity_stats = [dict(row) for row in activity_result] if activity_result else []
         
-        # Статистика по дням
+        # Статистика по дням: агрегируется в SQLite целиком по индексу (date_earned, points)
         daily_query = """
             SELECT 
                 date_earned,
                 COUNT(*) as activities_count,
-                SUM(points) as points_awarded,
-                COUNT(DISTINCT citizen_id) as active_citizens
+                SUM(points) as points_awarded
             FROM citizen_points
             WHERE date_earned >= ?
             GROUP BY date_earned
@@ -375,6 +408,30 @@ class PointsModel(BaseModel):
             'totals': total_stats
         }
     
+    def get_points_trend(self, days: int = 30) -> List[sqlite3.Row]:
+        """
+        Сумма начисленных баллов по дням (агрегация в SQL)
+        
+        Args:
+            days: Количество дней назад
+            
+        Returns:
+            Строки (date, points_awarded, activities_count), отсортированные по дате
+        """
+        query = """
+            SELECT 
+                date_earned as date,
+                SUM(points) as points_awarded,
+                COUNT(*) as activities_count
+            FROM citizen_points 
+            WHERE date_earned >= date('now', ?)
+            GROUP BY date_earned
+            ORDER BY date_earned
+        """
+        
+        result = self.db.execute_query(query, (f'-{days} days',))
+        return result if result else []
+    
     def get_citizen_rank(self, citizen_id: int) -> Optional[int]:
         """
         Получение позиции гражданина в рейтинге
@@ -415,24 +472,45 @@ class PointsModel(BaseModel):
         else:
             end_date = date(year, month + 1, 1) - timedelta(days=1)
         
-        # Топ граждан за месяц
-        top_citizens_query = """
-            SELECT 
-                c.full_name,
-                SUM(cp.points) as month_points,
-                COUNT(cp.id) as activities_count
-            FROM citizen_points cp
-            JOIN citizens c ON cp.citizen_id = c.id
-            WHERE cp.date_earned BETWEEN ? AND ?
-            AND c.is_active = 1
-            GROUP BY c.id, c.full_name
-            HAVING month_points > 0
-            ORDER BY month_points DESC
-            LIMIT 10
+        # Топ граждан и общие метрики за месяц одним запросом:
+        # итоги считаются по помесячным суммам граждан и повторяются в каждой строке топа
+        summary_query = """
+            WITH month_points AS (
+                SELECT 
+                    citizen_id,
+                    SUM(points) as month_points,
+                    COUNT(*) as activities_count
+                FROM citizen_points
+                WHERE date_earned BETWEEN ? AND ?
+                GROUP BY citizen_id
+            ),
+            totals AS (
+                SELECT 
+                    COALESCE(SUM(activities_count), 0) as total_activities,
+                    SUM(month_points) as total_points,
+                    COUNT(*) as active_citizens,
+                    SUM(month_points) * 1.0 / SUM(activities_count) as avg_points
+                FROM month_points
+            ),
+            top_citizens AS (
+                SELECT 
+                    c.full_name,
+                    mp.month_points,
+                    mp.activities_count
+                FROM month_points mp
+                JOIN citizens c ON mp.citizen_id = c.id
+                WHERE c.is_active = 1 AND mp.month_points > 0
+                ORDER BY mp.month_points DESC
+                LIMIT 10
+            )
+            SELECT t.*, tc.full_name, tc.month_points, tc.activities_count
+            FROM totals t
+            LEFT JOIN top_citizens tc ON 1 = 1
+            ORDER BY tc.month_points DESC
         """
         
-        top_result = self.db.execute_query(
-            top_citizens_query, 
+        summary_result = self.db.execute_query(
+            summary_query,
             (start_date.isoformat(), end_date.isoformat())
         )
         
@@ -453,27 +531,17 @@ class PointsModel(BaseModel):
             (start_date.isoformat(), end_date.isoformat())
         )
         
-        # Общие метрики за месяц
-        total_query = """
-            SELECT 
-                COUNT(*) as total_activities,
-                SUM(points) as total_points,
-                COUNT(DISTINCT citizen_id) as active_citizens,
-                AVG(points) as avg_points
-            FROM citizen_points
-            WHERE date_earned BETWEEN ? AND ?
-        """
-        
-        total_result = self.db.execute_query(
-            total_query,
-            (start_date.isoformat(), end_date.isoformat())
-        )
+        totals_keys = ('total_activities', 'total_points', 'active_citizens', 'avg_points')
+        top_keys = ('full_name', 'month_points', 'activities_count')
         
         return {
             'period': f"{year}-{month:02d}",
-            'top_citizens': [dict(row) for row in top_result] if top_result else [],
+            'top_citizens': [
+                {key: row[key] for key in top_keys}
+                for row in summary_result or [] if row['full_name'] is not None
+            ],
             'activity_breakdown': [dict(row) for row in activity_result] if activity_result else [],
-            'totals': dict(total_result[0]) if total_result else {}
+            'totals': {key: summary_result[0][key] for key in totals_keys} if summary_result else {}
         }
     
     def award_meeting_attendance_points(self, meeting_id: int, attendance_data: Dict[int, bool]) -> int:
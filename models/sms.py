@@ -8,6 +8,7 @@ from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 from .base import BaseModel
 
@@ -25,6 +26,12 @@ class SMSModel(BaseModel):
         # Максимальная длина SMS
         self.max_sms_length = 160
         self.max_title_length = 255
+        
+        # Размер пачки записей журнала и число потоков отправки при рассылке
+        from config.settings import get_settings
+        settings = get_settings()
+        self.batch_size = settings.SMS_BATCH_SIZE
+        self.send_workers = settings.SMS_SEND_WORKERS
     
     def validate_data(self, data: Dict[str, Any]) -> Dict[str, List[str]]:
         """
@@ -107,13 +114,19 @@ class SMSModel(BaseModel):
         
         return campaign_id
     
-    def send_campaign(self, campaign_id: int, recipients: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def send_campaign(
+        self,
+        campaign_id: int,
+        recipients: List[Dict[str, Any]],
+        batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Отправка SMS кампании
         
         Args:
             campaign_id: ID кампании
             recipients: Список получателей с данными
+            batch_size: Размер пачки записей журнала (по умолчанию SMS_BATCH_SIZE)
             
         Returns:
             Результат отправки
@@ -132,106 +145,333 @@ class SMSModel(BaseModel):
         if not valid_recipients:
             return {'success': False, 'error': 'Нет получателей с валидными номерами'}
         
-        # Создаем записи в журнале SMS
+        batch_size = batch_size or self.batch_size
+        message_text = campaign['message_text']
+        
+        # Отправляем пачками: вызовы шлюза параллельно в пуле потоков,
+        # затем одна транзакция executemany на пачку записей журнала
         sent_count = 0
         failed_count = 0
+        unlogged_count = 0
         
-        for recipient in valid_recipients:
-            success = self._send_single_sms(
-                campaign_id=campaign_id,
-                citizen_id=recipient.get('citizen_id'),
-                phone=recipient['phone'],
-                message_text=campaign['message_text']
-            )
-            
-            if success:
-                sent_count += 1
-            else:
-                failed_count += 1
+        with ThreadPoolExecutor(max_workers=min(self.send_workers, batch_size)) as executor:
+            for start in range(0, len(valid_recipients), batch_size):
+                batch = valid_recipients[start:start + batch_size]
+                
+                futures = [
+                    executor.submit(self._deliver_sms, recipient['phone'], message_text)
+                    for recipient in batch
+                ]
+                
+                # Исключение шлюза помечает неудачным только это SMS,
+                # а не прерывает всю рассылку
+                errors = []
+                for recipient, future in zip(batch, futures):
+                    try:
+                        errors.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Ошибка отправки SMS на {recipient['phone']}: {e}")
+                        errors.append(str(e))
+                
+                batch_sent, batch_failed, batch_unlogged = self._log_sms_batch(
+                    campaign_id, batch, errors, message_text
+                )
+                sent_count += batch_sent
+                failed_count += batch_failed
+                unlogged_count += batch_unlogged
         
-        # Обновляем статистику кампании
-        self.update(campaign_id, {
-            'sent_count': sent_count,
-            'failed_count': failed_count,
-            'sent_at': datetime.now().isoformat()
-        })
+        # Обновляем статистику кампании (в sms_campaigns нет updated_at,
+        # поэтому не через BaseModel.update)
+        self.db.execute_query(
+            f"UPDATE {self.table_name} SET sent_count = ?, failed_count = ?, sent_at = ? WHERE id = ?",
+            (sent_count, failed_count, datetime.now().isoformat(), campaign_id),
+            fetch=False
+        )
         
         result = {
             'success': True,
             'sent_count': sent_count,
             'failed_count': failed_count,
-            'total_recipients': len(valid_recipients)
+            'total_recipients': len(valid_recipients),
+            'unlogged_count': unlogged_count
         }
         
-        self.log_action("send", campaign_id, f"Отправлено {sent_count} SMS, ошибок: {failed_count}")
+        action_details = f"Отправлено {sent_count} SMS, ошибок: {failed_count}"
+        if unlogged_count:
+            action_details += f", не записано в журнал: {unlogged_count}"
+        self.log_action("send", campaign_id, action_details)
         
         return result
     
-    def _send_single_sms(
-        self, 
-        campaign_id: int, 
-        citizen_id: Optional[int], 
-        phone: str, 
-        message_text: str
-    ) -> bool:
+    def _deliver_sms(self, phone: str, message_text: str) -> Optional[str]:
         """
-        Отправка одного SMS (в демо-режиме только логирование)
+        Передача одного SMS шлюзу провайдера (в демо-режиме без вызова)
         
         Args:
-            campaign_id: ID кампании
-            citizen_id: ID гражданина
             phone: Номер телефона
             message_text: Текст сообщения
             
         Returns:
-            Успешность отправки
+            None при успехе или текст ошибки
         """
-        try:
-            # В реальной системе здесь был бы вызов SMS API
-            # Сейчас просто создаем запись в журнале
-            
-            log_data = {
-                'campaign_id': campaign_id,
-                'citizen_id': citizen_id,
-                'phone': phone,
-                'message_text': message_text,
-                'status': 'SENT',  # В демо-режиме считаем что всё отправлено
-                'sent_at': datetime.now().isoformat()
-            }
-            
-            # Добавляем запись в журнал SMS
-            log_query = """
-                INSERT INTO sms_logs (campaign_id, citizen_id, phone, message_text, status, sent_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
+        # В реальной системе здесь был бы вызов SMS API;
+        # в демо-режиме считаем что всё отправлено
+        return None
+    
+    def _log_sms_batch(
+        self,
+        campaign_id: int,
+        batch: List[Dict[str, Any]],
+        errors: List[Optional[str]],
+        message_text: str
+    ) -> Tuple[int, int, int]:
+        """
+        Запись результатов пачки SMS в журнал одной транзакцией
+        
+        Если пачка не записалась, строки пишутся по одной, чтобы одна
+        ошибочная запись не теряла всю пачку. Счетчики доставки от
+        результата записи журнала не зависят.
+        
+        Args:
+            campaign_id: ID кампании
+            batch: Получатели пачки
+            errors: Результаты _deliver_sms для каждого получателя
+            message_text: Текст сообщения
             
-            result = self.db.execute_query(
-                log_query,
-                (log_data['campaign_id'], log_data['citizen_id'], log_data['phone'],
-                 log_data['message_text'], log_data['status'], log_data['sent_at']),
-                fetch=False
+        Returns:
+            Количество отправленных и неудачных SMS пачки
+            и количество строк, не записанных в журнал
+        """
+        sent_at = datetime.now().isoformat()
+        
+        log_query = """
+            INSERT INTO sms_logs (campaign_id, citizen_id, phone, message_text, status, sent_at, error_message)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        
+        rows = [
+            (
+                campaign_id, recipient.get('citizen_id'), recipient['phone'], message_text,
+                'FAILED' if error else 'SENT', None if error else sent_at, error
             )
-            
-            return result is not None
-            
-        except Exception as e:
-            logger.error(f"Ошибка отправки SMS: {e}")
-            
-            # Записываем ошибку в журнал
-            error_log_query = """
-                INSERT INTO sms_logs (campaign_id, citizen_id, phone, message_text, status, error_message)
-                VALUES (?, ?, ?, ?, 'FAILED', ?)
-            """
-            
-            self.db.execute_query(
-                error_log_query,
-                (campaign_id, citizen_id, phone, message_text, str(e)),
-                fetch=False
+            for recipient, error in zip(batch, errors)
+        ]
+        
+        failed = sum(1 for error in errors if error)
+        sent = len(batch) - failed
+        
+        if self.db.execute_many(log_query, rows):
+            return sent, failed, 0
+        
+        logger.error(f"Ошибка записи пачки SMS в журнал (кампания {campaign_id}, {len(batch)} шт.)")
+        
+        # Повторяем запись по одной строке
+        unlogged = sum(
+            1 for row in rows
+            if self.db.execute_query(log_query, row, fetch=False) is None
+        )
+        
+        if unlogged:
+            logger.error(
+                f"Не удалось записать в журнал {unlogged} из {len(batch)} SMS (кампания {campaign_id})"
             )
-            
-            return False
+        
+        return sent, failed, unlogged
     
     def _validate_phone(self, phone: str) -> bool:
         """Валидация номера телефона"""
         # Узбекские номера: +998xxxxxxxxx
-        phone_pattern = r'^(\+?998|8)?[0-9]{9}$'
\ No newline at end of file
+        phone_pattern = r'^(\+?998|8)?[0-9]{9}$'
+        return bool(re.match(phone_pattern, phone))
+    
+    def get_daily_sent(self, where_clause: str = "", params: tuple = None) -> List[sqlite3.Row]:
+        """
+        Количество отправленных SMS по дням создания кампаний (агрегация в SQL)
+        
+        Args:
+            where_clause: Условие WHERE для кампаний (без слова WHERE)
+            params: Параметры для условия
+            
+        Returns:
+            Строки (day, sms_count), отсортированные по дню
+        """
+        query = f"SELECT substr(created_at, 1, 10) as day, SUM(COALESCE(sent_count, 0)) as sms_count FROM {self.table_name}"
+        
+        if where_clause:
+            query += f" WHERE {where_clause}"
+        
+        query += " GROUP BY day ORDER BY day"
+        
+        result = self.db.execute_query(query, params)
+        return result if result else []
+    
+    def get_type_counts(self, where_clause: str = "", params: tuple = None) -> List[sqlite3.Row]:
+        """
+        Количество кампаний по типам (агрегация в SQL)
+        
+        Args:
+            where_clause: Условие WHERE для кампаний (без слова WHERE)
+            params: Параметры для условия
+            
+        Returns:
+            Строки (campaign_type, campaigns_count)
+        """
+        query = f"SELECT campaign_type, COUNT(*) as campaigns_count FROM {self.table_name}"
+        
+        if where_clause:
+            query += f" WHERE {where_clause}"
+        
+        query += " GROUP BY campaign_type ORDER BY campaigns_count DESC"
+        
+        result = self.db.execute_query(query, params)
+        return result if result else []
+    
+    def get_campaigns_page(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        where_clause: str = "",
+        params: tuple = None
+    ) -> Dict[str, Any]:
+        """
+        Страница кампаний (новые сначала) с процентом доставки, вычисленным в SQL
+        
+        Args:
+            page: Номер страницы (начиная с 1)
+            page_size: Размер страницы
+            where_clause: Условие WHERE
+            params: Параметры для условия
+            
+        Returns:
+            Словарь с данными и метаинформацией, как у get_paginated;
+            у каждой записи есть колонка success_rate
+        """
+        return self.get_paginated(
+            page, page_size, where_clause, params, "created_at DESC",
+            columns="""*, CASE WHEN sent_count > 0
+                THEN COALESCE(delivered_count, 0) * 100.0 / sent_count
+                ELSE 0 END as success_rate"""
+        )
+    
+    def get_summary_counts(self) -> Dict[str, int]:
+        """
+        Сводные счетчики кампаний и SMS одним запросом
+        
+        Returns:
+            Словарь: total_campaigns, monthly_campaigns, total_sms, delivered, failed
+        """
+        query = f"""
+            SELECT * FROM
+                (
+                    SELECT 
+                        COUNT(*) as total_campaigns,
+                        COALESCE(SUM(CASE WHEN created_at >= date('now', '-30 days') THEN 1 ELSE 0 END), 0) as monthly_campaigns
+                    FROM {self.table_name}
+                ),
+                (
+                    SELECT 
+                        COUNT(*) as total_sms,
+                        COALESCE(SUM(CASE WHEN status = 'DELIVERED' THEN 1 ELSE 0 END), 0) as delivered,
+                        COALESCE(SUM(CASE WHEN status = 'FAILED' THEN 1 ELSE 0 END), 0) as failed
+                    FROM sms_logs
+                )
+        """
+        
+        result = self.db.execute_query(query)
+        return dict(result[0]) if result else {}
+    
+    def get_monthly_totals(self) -> Dict[str, int]:
+        """
+        Счетчики кампаний и SMS за последние 30 дней одним запросом
+        
+        SMS считаются по журналу sms_logs: счетчик delivered_count
+        кампаний при отправке не обновляется.
+        
+        Returns:
+            Словарь: total_campaigns, monthly_campaigns, monthly_sms, monthly_delivered
+        """
+        query = f"""
+            SELECT * FROM
+                (
+                    SELECT 
+                        COUNT(*) as total_campaigns,
+                        COALESCE(SUM(CASE WHEN created_at >= date('now', '-30 days') THEN 1 ELSE 0 END), 0) as monthly_campaigns
+                    FROM {self.table_name}
+                ),
+                (
+                    SELECT 
+                        COUNT(*) as monthly_sms,
+                        COALESCE(SUM(CASE WHEN status = 'DELIVERED' THEN 1 ELSE 0 END), 0) as monthly_delivered
+                    FROM sms_logs
+                    WHERE created_at >= date('now', '-30 days')
+                )
+        """
+        
+        result = self.db.execute_query(query)
+        return dict(result[0]) if result else {}
+    
+    def get_campaign_logs(
+        self,
+        campaign_id: int,
+        status: Optional[str] = None,
+        phone_search: str = "",
+        page: int = 1,
+        page_size: int = 500
+    ) -> Dict[str, Any]:
+        """
+        Журнал отправки кампании с фильтрацией и пагинацией на стороне БД
+        
+        Args:
+            campaign_id: ID кампании
+            status: Статус SMS (SENT, DELIVERED, FAILED) или None для всех
+            phone_search: Подстрока номера телефона
+            page: Номер страницы (начиная с 1)
+            page_size: Размер страницы
+            
+        Returns:
+            Словарь с данными (full_name, phone, status, sent_at, error_message)
+            и метаинформацией, как у get_paginated
+        """
+        conditions = ["sl.campaign_id = ?"]
+        params = [campaign_id]
+        
+        if status:
+            conditions.append("sl.status = ?")
+            params.append(status)
+        
+        if phone_search:
+            conditions.append("instr(sl.phone, ?) > 0")
+            params.append(phone_search)
+        
+        where_clause = " AND ".join(conditions)
+        
+        count_result = self.db.execute_query(
+            f"SELECT COUNT(*) as count FROM sms_logs sl WHERE {where_clause}", tuple(params)
+        )
+        total_count = count_result[0]['count'] if count_result else 0
+        
+        total_pages = (total_count + page_size - 1) // page_size
+        page = min(max(page, 1), max(total_pages, 1))
+        
+        query = f"""
+            SELECT c.full_name, sl.phone, sl.status, sl.sent_at, sl.error_message
+            FROM sms_logs sl
+            LEFT JOIN citizens c ON sl.citizen_id = c.id
+            WHERE {where_clause}
+            ORDER BY sl.created_at DESC
+            LIMIT ? OFFSET ?
+        """
+        
+        records = self.db.execute_query(query, tuple(params) + (page_size, (page - 1) * page_size))
+        
+        return {
+            'data': records if records else [],
+            'pagination': {
+                'page': page,
+                'page_size': page_size,
+                'total_count': total_count,
+                'total_pages': total_pages,
+                'has_next': page < total_pages,
+                'has_prev': page > 1
+            }
+        }
@@ -4,14 +4,15 @@
 
 import streamlit as st
 import pandas as pd
+import io
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 
-from config.database import DatabaseManager
 from models.citizen import CitizenModel
 from utils.helpers import (
     format_phone, format_date, Paginator, 
-    create_excel_download_button, show_success_message, show_error_message
+    create_excel_download_button, show_success_message, show_error_message,
+    get_database_manager
 )
 from utils.auth import get_current_user_id, has_permission
 from utils.validators import validate_citizen_data, StreamlitValidationHelper
@@ -28,7 +29,7 @@ def show_citizens_page():
         return
     
     # Инициализируем модель
-    db = DatabaseManager()
+    db = get_database_manager()
     citizen_model = CitizenModel(db)
     
     # Боковая панель с действиями
@@ -591,10 +592,13 @@ def handle_export(citizen_model: CitizenModel):
             create_excel_download_button(df_export, filename, "📥 Скачать Excel файл")
         else:
             filename = f"граждане_махалли_{timestamp}.csv"
-            csv_data = df_export.to_csv(index=False, encoding='utf-8')
+            # Пишем порциями сразу в байтовый буфер, без промежуточной строки
+            buffer = io.BytesIO()
+            df_export.to_csv(buffer, index=False, encoding='utf-8', chunksize=10_000)
+            buffer.seek(0)
             st.download_button(
                 label="📥 Скачать CSV файл",
-                data=csv_data,
+                data=buffer,
                 file_name=filename,
                 mime="text/csv"
             )
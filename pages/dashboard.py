@@ -9,12 +9,13 @@ from datetime import datetime, date, timedelta
 import pandas as pd
 from typing import Dict, Any, List
 
-from config.database import DatabaseManager
 from models.citizen import CitizenModel
 from models.meeting import MeetingModel
 from models.points import PointsModel
 from models.sms import SMSModel
-from utils.helpers import create_metrics_row, create_pie_chart, create_bar_chart, format_date
+from utils.helpers import (
+    create_metrics_row, create_pie_chart, create_bar_chart, format_date, get_database_manager
+)
 from utils.auth import get_current_user
 
 def safe_get(row_obj, key, default=None):
@@ -63,7 +64,7 @@ def show_dashboard():
     st.markdown("---")
     
     # Инициализируем модели
-    db = DatabaseManager()
+    db = get_database_manager()
     citizen_model = CitizenModel(db)
     meeting_model = MeetingModel(db)
     points_model = PointsModel(db)
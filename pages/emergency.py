@@ -11,7 +11,8 @@ from config.database import DatabaseManager
 from config.settings import SMS_TEMPLATES
 from models.citizen import CitizenModel
 from utils.helpers import (
-    format_datetime, show_success_message, show_error_message
+    format_datetime, show_success_message, show_error_message,
+    get_database_manager
 )
 from utils.auth import get_current_user_id, has_permission
 
@@ -34,7 +35,7 @@ def show_emergency_page():
     """)
     
     # Инициализируем модели
-    db = DatabaseManager()
+    db = get_database_manager()
     citizen_model = CitizenModel(db)
     
     # Боковая панель с быстрыми действиями
@@ -168,7 +169,7 @@ def show_emergency_main(citizen_model: CitizenModel):
     # Последние экстренные уведомления
     st.markdown("### 📋 Последние экстренные уведомления")
     
-    recent_emergencies = get_recent_emergency_notifications(DatabaseManager())
+    recent_emergencies = get_recent_emergency_notifications(get_database_manager())
     
     if recent_emergencies:
         for emergency in recent_emergencies[:5]:
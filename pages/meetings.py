@@ -7,13 +7,13 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
-from config.database import DatabaseManager
 from models.meeting import MeetingModel
 from models.citizen import CitizenModel
 from models.points import PointsModel
 from utils.helpers import (
     format_date, format_datetime, Paginator,
-    create_excel_download_button, show_success_message, show_error_message
+    create_excel_download_button, show_success_message, show_error_message,
+    get_database_manager
 )
 from utils.auth import get_current_user_id, has_permission
 from utils.validators import validate_meeting_data, StreamlitValidationHelper
@@ -30,7 +30,7 @@ def show_meetings_page():
         return
     
     # Инициализируем модели
-    db = DatabaseManager()
+    db = get_database_manager()
     meeting_model = MeetingModel(db)
     citizen_model = CitizenModel(db)
     points_model = PointsModel(db)
@@ -2,24 +2,160 @@
 Страница системы баллов и поощрений
 """
 
+import io
+import html
+from types import MappingProxyType
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
-from config.database import DatabaseManager
 from models.points import PointsModel
 from models.citizen import CitizenModel
 from models.meeting import MeetingModel
 from utils.helpers import (
     format_date, format_datetime, Paginator,
-    create_excel_download_button, show_success_message, show_error_message
+    create_excel_download_button, show_success_message, show_error_message,
+    get_database_manager, downsample_lttb
 )
 from utils.auth import get_current_user_id, has_permission
 
 
+# Предопределенные типы активности (общие для форм начисления и настроек)
+_ACTIVITY_TYPES = [
+    {
+        'name': 'meeting_attendance',
+        'display_name': 'Посещение заседания',
+        'points_value': 10,
+        'description': 'Баллы за участие в заседаниях махалли',
+        'is_active': True
+    },
+    {
+        'name': 'subbotnik',
+        'display_name': 'Участие в субботнике',
+        'points_value': 15,
+        'description': 'Баллы за участие в субботниках и уборке территории',
+        'is_active': True
+    },
+    {
+        'name': 'community_work',
+        'display_name': 'Общественная работа',
+        'points_value': 10,
+        'description': 'Баллы за различные виды общественной деятельности',
+        'is_active': True
+    },
+    {
+        'name': 'volunteer_work',
+        'display_name': 'Волонтерская деятельность',
+        'points_value': 12,
+        'description': 'Баллы за волонтерскую помощь и добровольную работу',
+        'is_active': True
+    },
+    {
+        'name': 'initiative',
+        'display_name': 'Инициатива',
+        'points_value': 8,
+        'description': 'Баллы за проявление инициативы и предложения',
+        'is_active': True
+    }
+]
+
+# Индекс типов активности по системному имени для поиска за O(1)
+_ACTIVITY_TYPES_BY_NAME = MappingProxyType({at['name']: at for at in _ACTIVITY_TYPES})
+
+# Колонки рейтинга: за все время показываем total_points, за период - period_points
+_LEADERBOARD_CFG_ALLTIME = {
+    "position": st.column_config.NumberColumn("🏆 Место", width="small"),
+    "full_name": st.column_config.TextColumn("ФИО", width="medium"),
+    "total_points": st.column_config.NumberColumn("⭐ Баллы", width="small"),
+    "activities_count": st.column_config.NumberColumn("📊 Активностей", width="small"),
+    "phone": st.column_config.TextColumn("📞 Телефон", width="medium"),
+    "address": st.column_config.TextColumn("📍 Адрес", width="large")
+}
+
+_LEADERBOARD_CFG_PERIOD = {
+    ("period_points" if key == "total_points" else key): config
+    for key, config in _LEADERBOARD_CFG_ALLTIME.items()
+}
+
+# Справочники ниже обернуты в MappingProxyType: они только для чтения
+# и безопасно разделяются между перезапусками и фрагментами
+
+# Короткие названия типов активности для графиков и сводок
+_ACTIVITY_NAMES = MappingProxyType({
+    'meeting_attendance': 'Заседания',
+    'subbotnik': 'Субботники',
+    'community_work': 'Общ. работы',
+    'volunteer_work': 'Волонтерство',
+    'initiative': 'Инициативы'
+})
+
+# Иконки типов активности для карточек начислений
+_ACTIVITY_ICONS = MappingProxyType({
+    'meeting_attendance': '🏛️',
+    'subbotnik': '🧹',
+    'community_work': '🤝',
+    'volunteer_work': '❤️',
+    'initiative': '💡'
+})
+
+# Подписи типов активности в истории начислений
+_HISTORY_ACTIVITY_LABELS = MappingProxyType({
+    'meeting_attendance': '🏛️ Заседание',
+    'subbotnik': '🧹 Субботник',
+    'community_work': '🤝 Общественная работа',
+    'volunteer_work': '❤️ Волонтерство',
+    'initiative': '💡 Инициатива'
+})
+
+# Колонки таблицы истории начислений
+_HISTORY_COLUMN_CONFIG = {
+    "date_earned": st.column_config.DateColumn("📅 Дата", format="DD.MM.YYYY", width="small"),
+    "activity_type": st.column_config.TextColumn("Активность", width="medium"),
+    "points": st.column_config.NumberColumn("⭐ Баллы", format="%d", width="small"),
+    "description": st.column_config.TextColumn("📝 Описание", width="large"),
+    "meeting_title": st.column_config.TextColumn("🏛️ Заседание", width="medium"),
+    "created_at": st.column_config.DatetimeColumn("Начислено", format="DD.MM.YYYY HH:mm", width="medium")
+}
+
+# Периоды фильтра истории начислений (в днях)
+_HISTORY_PERIOD_DAYS = MappingProxyType({
+    "Все время": None,
+    "За месяц": 30,
+    "За квартал": 90,
+    "За год": 365
+})
+
+# HTML-шаблоны карточек начислений: список рендерится одним st.markdown
+_AWARD_CARD_TEMPLATE = (
+    '<div style="display: flex; align-items: center; gap: 12px; padding: 8px 0; '
+    'border-bottom: 1px solid rgba(128, 128, 128, 0.3);">'
+    '<div style="flex: 3;">{icon} <b>{full_name}</b>{details}</div>'
+    '<div style="flex: 1; color: {color}; font-size: 18px; font-weight: bold; text-align: center;">'
+    '{sign}{points} баллов</div>'
+    '<div style="flex: 1; color: gray; font-size: 14px;">{created_at}</div>'
+    '</div>'
+)
+_AWARD_DETAIL_TEMPLATE = '<br><small style="color: gray;">{icon} {text}</small>'
+
+# Карточки достижений выводятся одной CSS-сеткой
+_ACHIEVEMENTS_GRID_TEMPLATE = (
+    '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 10px;">'
+    '{cards}</div>'
+)
+_ACHIEVEMENT_CARD_TEMPLATE = (
+    '<div style="background: linear-gradient(45deg, #FFD700, #FFA500); color: white; '
+    'padding: 15px; border-radius: 10px; text-align: center;">'
+    '<h4>{name}</h4><small>{description}</small></div>'
+)
+
+# Предел точек на линейных графиках, выше которого данные прореживаются (LTTB)
+_MAX_CHART_POINTS = 2000
+
+
 def safe_get(row_obj, key, default=None):
     """Безопасное получение значения из sqlite3.Row или dict"""
     try:
@@ -60,6 +196,14 @@ def row_to_dict(row):
         except:
             return {}
 
+
+@st.cache_resource
+def _get_models():
+    """Модели страницы баллов поверх общего менеджера БД (создаются один раз)"""
+    db = get_database_manager()
+    return PointsModel(db), CitizenModel(db), MeetingModel(db)
+
+
 def show_points_page():
     """Главная функция страницы системы баллов"""
     
@@ -72,10 +216,7 @@ def show_points_page():
         return
     
     # Инициализируем модели
-    db = DatabaseManager()
-    points_model = PointsModel(db)
-    citizen_model = CitizenModel(db)
-    meeting_model = MeetingModel(db)
+    points_model, citizen_model, meeting_model = _get_models()
     
     # Боковая панель с действиями
     with st.sidebar:
@@ -98,7 +239,7 @@ def show_points_page():
         # Быстрая статистика
         st.markdown("### 📈 Сводка")
         
-        quick_stats = get_quick_points_stats(points_model, citizen_model)
+        quick_stats = _cached_quick_stats(points_model, citizen_model)
         
         st.metric("🏆 Активных граждан", quick_stats.get('active_citizens', 0))
         st.metric("⭐ Всего баллов", quick_stats.get('total_points', 0))
@@ -240,18 +381,8 @@ def show_points_main(points_model: PointsModel, citizen_model: CitizenModel):
                 activity_data = safe_get(monthly_stats, 'by_activity_type', [])
                 
                 # Переводим названия активностей
-                activity_names = {
-                    'meeting_attendance': 'Заседания',
-                    'subbotnik': 'Субботники',
-                    'community_work': 'Общ. работы',
-                    'volunteer_work': 'Волонтерство',
-                    'initiative': 'Инициативы'
-                }
-                
                 df_activity = pd.DataFrame(activity_data)
-                df_activity['display_name'] = df_activity['activity_type'].map(
-                    lambda x: activity_names.get(x, x)
-                )
+                df_activity['display_name'] = df_activity['activity_type'].map(_ACTIVITY_NAMES).fillna(df_activity['activity_type'])
                 
                 fig = px.pie(
                     df_activity,
@@ -289,13 +420,7 @@ def show_points_main(points_model: PointsModel, citizen_model: CitizenModel):
     # Последние начисления
     st.markdown("#### 📋 Последние начисления баллов")
     
-    recent_awards = get_recent_point_awards(points_model)
-    
-    if recent_awards:
-        for award in recent_awards[:10]:
-            show_point_award_card(award)
-    else:
-        st.info("📭 Недавних начислений нет")
+    _recent_awards_fragment(points_model)
     
     # Распределение граждан по баллам
     st.markdown("---")
@@ -466,22 +591,15 @@ def show_single_citizen_award_form(points_model: PointsModel, citizen_model: Cit
                     st.error(f"❌ Ошибка получения данных гражданина: {str(citizen_error)}")
             
             # Тип активности
-            activity_types = {
-                'meeting_attendance': {'display_name': 'Посещение заседания', 'points_value': 10},
-                'subbotnik': {'display_name': 'Участие в субботнике', 'points_value': 15},
-                'community_work': {'display_name': 'Общественная работа', 'points_value': 10},
-                'volunteer_work': {'display_name': 'Волонтерская деятельность', 'points_value': 12},
-                'initiative': {'display_name': 'Инициатива', 'points_value': 8}
-            }
-            
             selected_activity = st.selectbox(
                 "Тип активности *",
-                options=list(activity_types.keys()),
-                format_func=lambda x: activity_types[x]['display_name'],
+                options=list(_ACTIVITY_TYPES_BY_NAME.keys()),
+                format_func=lambda x: _ACTIVITY_TYPES_BY_NAME[x]['display_name'],
                 help="Вид деятельности за который начисляются баллы"
             )
             
-            default_points = activity_types[selected_activity]['points_value']
+            selected_activity_type = _ACTIVITY_TYPES_BY_NAME.get(selected_activity)
+            default_points = selected_activity_type['points_value']
             st.caption(f"💡 Стандартно: {default_points} баллов")
         
         with col2:
@@ -565,7 +683,7 @@ def show_single_citizen_award_form(points_model: PointsModel, citizen_model: Cit
                 
                 today = datetime.now().date().isoformat()
                 now = datetime.now().isoformat()
-                desc = description.strip() if description else f"Начисление за {activity_types[selected_activity]['display_name']}"
+                desc = description.strip() if description else f"Начисление за {selected_activity_type['display_name']}"
                 
                 params = (
                     int(selected_citizen_id),
@@ -602,6 +720,7 @@ def show_single_citizen_award_form(points_model: PointsModel, citizen_model: Cit
                     )
                     st.write(f"✅ Результат обновления баллов: {update_result}")
                     
+                    _clear_points_cache()
                     show_success_message(f"✅ Начислено {points_to_award} баллов гражданину {citizen_name}")
                     
                     # Показываем новые баллы
@@ -658,23 +777,16 @@ def show_bulk_award_form(points_model: PointsModel, citizen_model: CitizenModel)
                 )
             
             # Тип активности - используем предопределенные типы (как в single_citizen_award_form)
-            activity_types = {
-                'meeting_attendance': {'display_name': 'Посещение заседания', 'points_value': 10},
-                'subbotnik': {'display_name': 'Участие в субботнике', 'points_value': 15},
-                'community_work': {'display_name': 'Общественная работа', 'points_value': 10},
-                'volunteer_work': {'display_name': 'Волонтерская деятельность', 'points_value': 12},
-                'initiative': {'display_name': 'Инициатива', 'points_value': 8}
-            }
-            
             selected_activity = st.selectbox(
                 "Тип активности *",
-                options=list(activity_types.keys()),
-                format_func=lambda x: activity_types[x]['display_name'],
+                options=list(_ACTIVITY_TYPES_BY_NAME.keys()),
+                format_func=lambda x: _ACTIVITY_TYPES_BY_NAME[x]['display_name'],
                 help="Вид деятельности за который начисляются баллы"
             )
             
             # Получаем стандартное количество баллов
-            default_points = activity_types[selected_activity]['points_value']
+            selected_activity_type = _ACTIVITY_TYPES_BY_NAME.get(selected_activity)
+            default_points = selected_activity_type['points_value']
         
         with col2:
             # Количество баллов
@@ -781,6 +893,7 @@ def show_bulk_award_form(points_model: PointsModel, citizen_model: CitizenModel)
                         errors.append(f"Ошибка для {recipient['full_name']}: {str(e)}")
                 
                 if successful > 0:
+                    _clear_points_cache()
                     show_success_message(
                         f"✅ Успешно начислено баллов: {successful} гражданам. "
                         f"Ошибок: {failed}"
@@ -833,18 +946,24 @@ def show_meeting_award_form(points_model: PointsModel, citizen_model: CitizenMod
             meeting = meeting_data['meeting']
             attendance_list = meeting_data['attendance']
             
+            # Признаки участников собираются в массивы за один проход,
+            # дальнейшие подсчеты и отбор выполняются булевыми масками
+            attendance_count = len(attendance_list)
+            present_mask = np.fromiter((bool(a['is_present']) for a in attendance_list), dtype=bool, count=attendance_count)
+            awarded_mask = np.fromiter((bool(a['points_earned']) for a in attendance_list), dtype=bool, count=attendance_count)
+            
             # Информация о заседании
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                st.metric("👥 Всего участников", len(attendance_list))
+                st.metric("👥 Всего участников", attendance_count)
             
             with col2:
-                present_count = sum(1 for a in attendance_list if a['is_present'])
+                present_count = int(present_mask.sum())
                 st.metric("✅ Присутствовали", present_count)
             
             with col3:
-                already_awarded = sum(1 for a in attendance_list if a['points_earned'])
+                already_awarded = int(awarded_mask.sum())
                 st.metric("🏆 Уже начислено", already_awarded)
             
             # Настройки начисления
@@ -867,12 +986,12 @@ def show_meeting_award_form(points_model: PointsModel, citizen_model: CitizenMod
             
             with col2:
                 # Предварительный расчет
+                # "Всем участникам" и "Только без баллов" - все, кому еще не начислено
+                eligible_mask = ~awarded_mask
                 if award_mode == "Только присутствующим":
-                    eligible_count = sum(1 for a in attendance_list if a['is_present'] and not a['points_earned'])
-                elif award_mode == "Всем участникам":
-                    eligible_count = sum(1 for a in attendance_list if not a['points_earned'])
-                else:  # Только без баллов
-                    eligible_count = sum(1 for a in attendance_list if not a['points_earned'])
+                    eligible_mask &= present_mask
+                
+                eligible_count = int(eligible_mask.sum())
                 
                 st.metric("👥 Получат баллы", eligible_count)
                 st.metric("⭐ Всего баллов", eligible_count * points_per_participant)
@@ -888,20 +1007,10 @@ def show_meeting_award_form(points_model: PointsModel, citizen_model: CitizenMod
                     return
                 
                 # Определяем кому начислять
-                attendance_data = {}
-                for attendance in attendance_list:
-                    citizen_id = attendance['citizen_id']
-                    
-                    should_award = False
-                    if award_mode == "Только присутствующим":
-                        should_award = attendance['is_present'] and not attendance['points_earned']
-                    elif award_mode == "Всем участникам":
-                        should_award = not attendance['points_earned']
-                    else:  # Только без баллов
-                        should_award = not attendance['points_earned']
-                    
-                    if should_award:
-                        attendance_data[citizen_id] = True
+                attendance_data = {
+                    attendance_list[i]['citizen_id']: True
+                    for i in np.flatnonzero(eligible_mask)
+                }
                 
                 # Начисляем баллы
                 awarded_count = points_model.award_meeting_attendance_points(
@@ -910,6 +1019,7 @@ def show_meeting_award_form(points_model: PointsModel, citizen_model: CitizenMod
                 )
                 
                 if awarded_count > 0:
+                    _clear_points_cache()
                     show_success_message(f"✅ Баллы начислены {awarded_count} участникам заседания")
                     st.rerun()
                 else:
@@ -948,7 +1058,7 @@ def show_leaderboard(points_model: PointsModel):
     with col3:
         export_format = st.selectbox(
             "Экспорт:",
-            ["Не экспортировать", "Excel", "CSV"]
+            ["Не экспортировать", "Excel", "CSV", "Parquet"]
         )
     
     # Получаем рейтинг
@@ -972,23 +1082,13 @@ def show_leaderboard(points_model: PointsModel):
         # Добавляем позицию в рейтинге
         df_leaderboard['position'] = range(1, len(df_leaderboard) + 1)
         
-        # Переименовываем колонки
-        column_config = {
-            "position": st.column_config.NumberColumn("🏆 Место", width="small"),
-            "full_name": st.column_config.TextColumn("ФИО", width="medium"),
-            "total_points": st.column_config.NumberColumn("⭐ Баллы", width="small") if period_days is None else None,
-            "period_points": st.column_config.NumberColumn("⭐ Баллы", width="small") if period_days else None,
-            "activities_count": st.column_config.NumberColumn("📊 Активностей", width="small"),
-            "phone": st.column_config.TextColumn("📞 Телефон", width="medium"),
-            "address": st.column_config.TextColumn("📍 Адрес", width="large")
-        }
-        
-        # Убираем None значения
-        column_config = {k: v for k, v in column_config.items() if v is not None}
+        # Конфигурация колонок подготовлена заранее для обоих вариантов рейтинга
+        column_config = _LEADERBOARD_CFG_PERIOD if period_days else _LEADERBOARD_CFG_ALLTIME
+        df_leaderboard = df_leaderboard.loc[:, list(column_config)]
         
         # Отображаем таблицу
         st.dataframe(
-            df_leaderboard[list(column_config.keys())],
+            df_leaderboard,
             column_config=column_config,
             use_container_width=True,
             hide_index=True
@@ -1001,15 +1101,29 @@ def show_leaderboard(points_model: PointsModel):
             
             if export_format == "Excel":
                 create_excel_download_button(
-                    df_leaderboard[list(column_config.keys())],
+                    df_leaderboard,
                     f"{filename}.xlsx",
                     "📥 Скачать рейтинг (Excel)"
                 )
+            elif export_format == "Parquet":
+                # Колоночный формат: компактнее и быстрее в записи, чем xlsx
+                buffer = io.BytesIO()
+                df_leaderboard.to_parquet(buffer, index=False)
+                buffer.seek(0)
+                st.download_button(
+                    label="📥 Скачать рейтинг (Parquet)",
+                    data=buffer,
+                    file_name=f"{filename}.parquet",
+                    mime="application/vnd.apache.parquet"
+                )
             else:  # CSV
-                csv_data = df_leaderboard[list(column_config.keys())].to_csv(index=False, encoding='utf-8')
+                # Пишем порциями сразу в байтовый буфер, без промежуточной строки
+                buffer = io.BytesIO()
+                df_leaderboard.to_csv(buffer, index=False, encoding='utf-8', chunksize=10_000)
+                buffer.seek(0)
                 st.download_button(
                     label="📥 Скачать рейтинг (CSV)",
-                    data=csv_data,
+                    data=buffer,
                     file_name=f"{filename}.csv",
                     mime="text/csv"
                 )
@@ -1029,6 +1143,42 @@ def show_points_statistics(points_model: PointsModel):
             st.session_state.points_action = "main"
             st.rerun()
     
+    # Метрики и графики за выбранный период перерисовываются отдельно от сводки
+    _statistics_period_fragment(points_model)
+    
+    # Месячная сводка
+    st.markdown("---")
+    st.markdown("#### 📋 Месячная сводка")
+    
+    current_date = datetime.now()
+    
+    monthly_summary = _cached_monthly_summary(points_model, current_date.year, current_date.month)
+    month_totals = monthly_summary.get('totals', {})
+    
+    # Пустой месяц определяем по уже полученной (кэшированной) сводке
+    if monthly_summary['top_citizens'] and month_totals.get('total_activities'):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("**🏆 Топ граждан месяца:**")
+            
+            for i, citizen in enumerate(monthly_summary['top_citizens'][:5], 1):
+                st.markdown(f"{i}. **{citizen['full_name']}** - {citizen['month_points']} баллов")
+        
+        with col2:
+            st.markdown("**📊 Статистика месяца:**")
+            
+            st.write(f"• Активностей: {month_totals.get('total_activities', 0)}")
+            st.write(f"• Баллов начислено: {month_totals.get('total_points', 0)}")
+            st.write(f"• Активных граждан: {month_totals.get('active_citizens', 0)}")
+    else:
+        st.info("📭 Нет данных за текущий месяц")
+
+
+@st.fragment
+def _statistics_period_fragment(points_model: PointsModel):
+    """Метрики и графики за выбранный период (перезапускается только этот блок)"""
+    
     # Выбор периода
     period = st.selectbox(
         "Период анализа:",
@@ -1058,6 +1208,11 @@ def show_points_statistics(points_model: PointsModel):
         avg_points = totals.get('avg_points_per_activity', 0)
         st.metric("📈 Средние баллы", f"{avg_points:.1f}" if avg_points else "0")
     
+    # Без начислений за период графики строить не из чего
+    if not totals.get('total_activities') and not totals.get('total_points_awarded'):
+        st.info("📭 Нет начислений за выбранный период")
+        return
+    
     st.markdown("---")
     
     # Графики
@@ -1069,30 +1224,9 @@ def show_points_statistics(points_model: PointsModel):
         if activity_data:
             st.markdown("#### 📊 Активность по типам")
             
-            df_activity = pd.DataFrame(activity_data)
-            
-            # Переводим названия
-            activity_names = {
-                'meeting_attendance': 'Заседания',
-                'subbotnik': 'Субботники',
-                'community_work': 'Общ. работы',
-                'volunteer_work': 'Волонтерство',
-                'initiative': 'Инициативы'
-            }
-            
-            df_activity['display_name'] = df_activity['activity_type'].map(
-                lambda x: activity_names.get(x, x)
+            fig = _activity_bar_figure(
+                tuple((row['activity_type'], row['total_points']) for row in activity_data)
             )
-            
-            fig = px.bar(
-                df_activity,
-                x='display_name',
-                y='total_points',
-                title="Баллы по видам активности",
-                labels={'display_name': 'Тип активности', 'total_points': 'Всего баллов'}
-            )
-            
-            fig.update_layout(showlegend=False)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Нет данных по активности")
@@ -1103,47 +1237,12 @@ def show_points_statistics(points_model: PointsModel):
         if daily_data:
             st.markdown("#### 📈 Динамика активности")
             
-            df_daily = pd.DataFrame(daily_data)
-            df_daily['date_earned'] = pd.to_datetime(df_daily['date_earned'])
-            
-            fig = px.line(
-                df_daily,
-                x='date_earned',
-                y='points_awarded',
-                title="Баллы по дням",
-                labels={'date_earned': 'Дата', 'points_awarded': 'Баллы'},
-                markers=True
+            fig = _daily_line_figure(
+                tuple((row['date_earned'], row['points_awarded']) for row in daily_data)
             )
-            
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("Нет данных по дням")
-    
-    # Месячная сводка
-    st.markdown("---")
-    st.markdown("#### 📋 Месячная сводка")
-    
-    current_date = datetime.now()
-    monthly_summary = points_model.get_monthly_summary(current_date.year, current_date.month)
-    
-    if monthly_summary['top_citizens']:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**🏆 Топ граждан месяца:**")
-            
-            for i, citizen in enumerate(monthly_summary['top_citizens'][:5], 1):
-                st.markdown(f"{i}. **{citizen['full_name']}** - {citizen['month_points']} баллов")
-        
-        with col2:
-            st.markdown("**📊 Статистика месяца:**")
-            
-            month_totals = monthly_summary.get('totals', {})
-            st.write(f"• Активностей: {month_totals.get('total_activities', 0)}")
-            st.write(f"• Баллов начислено: {month_totals.get('total_points', 0)}")
-            st.write(f"• Активных граждан: {month_totals.get('active_citizens', 0)}")
-    else:
-        st.info("📭 Нет данных за текущий месяц")
 
 
 def show_points_settings(points_model: PointsModel):
@@ -1159,43 +1258,7 @@ def show_points_settings(points_model: PointsModel):
             st.rerun()
     
     # Используем предопределенные типы активности
-    activity_types = [
-        {
-            'name': 'meeting_attendance',
-            'display_name': 'Посещение заседания',
-            'points_value': 10,
-            'description': 'Баллы за участие в заседаниях махалли',
-            'is_active': True
-        },
-        {
-            'name': 'subbotnik',
-            'display_name': 'Участие в субботнике',
-            'points_value': 15,
-            'description': 'Баллы за участие в субботниках и уборке территории',
-            'is_active': True
-        },
-        {
-            'name': 'community_work',
-            'display_name': 'Общественная работа',
-            'points_value': 10,
-            'description': 'Баллы за различные виды общественной деятельности',
-            'is_active': True
-        },
-        {
-            'name': 'volunteer_work',
-            'display_name': 'Волонтерская деятельность',
-            'points_value': 12,
-            'description': 'Баллы за волонтерскую помощь и добровольную работу',
-            'is_active': True
-        },
-        {
-            'name': 'initiative',
-            'display_name': 'Инициатива',
-            'points_value': 8,
-            'description': 'Баллы за проявление инициативы и предложения',
-            'is_active': True
-        }
-    ]
+    activity_types = _ACTIVITY_TYPES
     
     st.markdown("#### 📋 Типы активности и баллы")
     
@@ -1316,22 +1379,14 @@ def show_citizen_points_details(points_model: PointsModel, citizen_model: Citize
     if achievements_list:
         st.markdown("#### 🏅 Достижения")
         
-        cols = st.columns(len(achievements_list))
-        for i, achievement in enumerate(achievements_list):
-            with cols[i % len(cols)]:
-                st.markdown(f"""
-                <div style="
-                    background: linear-gradient(45deg, #FFD700, #FFA500);
-                    color: white;
-                    padding: 15px;
-                    border-radius: 10px;
-                    text-align: center;
-                    margin: 5px;
-                ">
-                    <h4>{achievement['name']}</h4>
-                    <small>{achievement['description']}</small>
-                </div>
-                """, unsafe_allow_html=True)
+        cards = "".join(
+            _ACHIEVEMENT_CARD_TEMPLATE.format(
+                name=html.escape(str(achievement['name'])),
+                description=html.escape(str(achievement['description']))
+            )
+            for achievement in achievements_list
+        )
+        st.markdown(_ACHIEVEMENTS_GRID_TEMPLATE.format(cards=cards), unsafe_allow_html=True)
     
     # История активности
     st.markdown("---")
@@ -1344,27 +1399,9 @@ def show_citizen_points_details(points_model: PointsModel, citizen_model: Citize
         
         with col1:
             # График по типам активности
-            df_breakdown = pd.DataFrame(activity_breakdown)
-            
-            activity_names = {
-                'meeting_attendance': 'Заседания',
-                'subbotnik': 'Субботники',
-                'community_work': 'Общ. работы',
-                'volunteer_work': 'Волонтерство',
-                'initiative': 'Инициативы'
-            }
-            
-            df_breakdown['display_name'] = df_breakdown['activity_type'].map(
-                lambda x: activity_names.get(x, x)
-            )
-            
-            fig = px.pie(
-                df_breakdown,
-                values='points',
-                names='display_name',
-                title="Баллы по типам активности"
+            fig = _breakdown_pie_figure(
+                tuple((row['activity_type'], row['points']) for row in activity_breakdown)
             )
-            
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
@@ -1372,7 +1409,7 @@ def show_citizen_points_details(points_model: PointsModel, citizen_model: Citize
             st.markdown("**📊 Детализация по активности:**")
             
             for activity in activity_breakdown:
-                activity_name = activity_names.get(activity['activity_type'], activity['activity_type'])
+                activity_name = _ACTIVITY_NAMES.get(activity['activity_type'], activity['activity_type'])
                 st.markdown(f"• **{activity_name}**: {activity['count']} раз, {activity['points']} баллов")
     
     # Подробная история
@@ -1381,58 +1418,84 @@ def show_citizen_points_details(points_model: PointsModel, citizen_model: Citize
     points_history = points_model.get_citizen_points_history(citizen_id, limit=50)
     
     if points_history:
-        # Фильтры
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            activity_filter = st.selectbox(
-                "Тип активности:",
-                ["Все"] + list(set(h['activity_type'] for h in points_history))
-            )
-        
-        with col2:
-            period_filter = st.selectbox(
-                "Период:",
-                ["Все время", "За месяц", "За квартал", "За год"]
-            )
-        
-        # Фильтруем историю
-        filtered_history = filter_points_history(points_history, activity_filter, period_filter)
-        
-        if filtered_history:
-            # Отображаем историю
-            for record in filtered_history:
-                show_point_record_card(record)
-        else:
-            st.info("📭 Нет записей по заданным фильтрам")
+        _history_filters_fragment(points_model, citizen_id, points_history)
     else:
         st.info("📭 История начислений пуста")
 
 
+@st.fragment
+def _history_filters_fragment(points_model: PointsModel, citizen_id: int, points_history: List[Dict[str, Any]]):
+    """Фильтры и список истории начислений (перезапускается только этот блок)"""
+    
+    # Фильтры
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        activity_filter = st.selectbox(
+            "Тип активности:",
+            ["Все"] + _cached_citizen_activity_types(points_model, citizen_id)
+        )
+    
+    with col2:
+        period_filter = st.selectbox(
+            "Период:",
+            list(_HISTORY_PERIOD_DAYS.keys())
+        )
+    
+    # Фильтруем историю на стороне БД
+    period_days = _HISTORY_PERIOD_DAYS[period_filter]
+    
+    if activity_filter == "Все" and period_days is None:
+        filtered_history = points_history
+    else:
+        filtered_history = points_model.get_citizen_points_history(
+            citizen_id,
+            limit=50,
+            activity_type=activity_filter if activity_filter != "Все" else None,
+            since=datetime.now() - timedelta(days=period_days) if period_days else None
+        )
+    
+    if filtered_history:
+        # Отображаем историю одной таблицей
+        show_points_history_table(filtered_history)
+    else:
+        st.info("📭 Нет записей по заданным фильтрам")
+
+
+@st.fragment(run_every=30)
+def _recent_awards_fragment(points_model: PointsModel):
+    """Последние начисления, обновляются каждые 30 секунд без перезапуска страницы"""
+    
+    recent_awards = _cached_recent_awards(points_model)
+    
+    if recent_awards:
+        show_point_awards_bulk(recent_awards[:10])
+    else:
+        st.info("📭 Недавних начислений нет")
+
+
 # Вспомогательные функции
 
 def get_quick_points_stats(points_model: PointsModel, citizen_model: CitizenModel) -> Dict[str, Any]:
     """Получение быстрой статистики системы баллов"""
     
-    try:
-        # Активные граждане с баллами
-        active_citizens = citizen_model.count("is_active = 1 AND total_points > 0")
-    except:
-        active_citizens = 0
+    # Все три показателя одним запросом вместо трех обращений к БД
+    stats_query = """
+        SELECT
+            (SELECT COUNT(*) FROM citizens WHERE is_active = 1 AND total_points > 0) as active,
+            (SELECT COALESCE(SUM(total_points), 0) FROM citizens WHERE is_active = 1) as total,
+            (SELECT COUNT(*) FROM citizen_points WHERE date_earned >= date('now', '-30 days')) as monthly
+    """
     
     try:
-        # Общая сумма баллов
-        total_points_query = "SELECT COALESCE(SUM(total_points), 0) as total FROM citizens WHERE is_active = 1"
-        total_result = citizen_model.db.execute_query(total_points_query)
-        total_points = safe_get(total_result[0], 'total', 0) if total_result else 0
+        result = points_model.db.execute_query(stats_query)
+        row = result[0] if result else None
     except:
-        total_points = 0
+        row = None
     
-    try:
-        # Активности за месяц
-        monthly_activities = points_model.count("date_earned >= date('now', '-30 days')")
-    except:
-        monthly_activities = 0
+    active_citizens = safe_get(row, 'active', 0) if row else 0
+    total_points = safe_get(row, 'total', 0) if row else 0
+    monthly_activities = safe_get(row, 'monthly', 0) if row else 0
     
     return {
         'active_citizens': active_citizens,
@@ -1441,6 +1504,127 @@ def get_quick_points_stats(points_model: PointsModel, citizen_model: CitizenMode
     }
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_quick_stats(_points_model: PointsModel, _citizen_model: CitizenModel) -> Dict[str, Any]:
+    """Кэшированная быстрая статистика для боковой панели"""
+    return get_quick_points_stats(_points_model, _citizen_model)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_recent_awards(_points_model: PointsModel, limit: int = 10) -> List[Dict[str, Any]]:
+    """Кэшированный список недавних начислений"""
+    return get_recent_point_awards(_points_model, limit)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _cached_citizen_activity_types(_points_model: PointsModel, citizen_id: int) -> List[str]:
+    """Кэшированный список типов активности гражданина для фильтра истории"""
+    return _points_model.get_distinct_activity_types_for_citizen(citizen_id)
+
+
+def _cached_monthly_summary(points_model: PointsModel, year: int, month: int) -> Dict[str, Any]:
+    """Месячная сводка по баллам: прошедшие месяцы кэшируются дольше текущего"""
+    
+    today = date.today()
+    if (year, month) < (today.year, today.month):
+        return _cached_past_monthly_summary(points_model, year, month)
+    
+    return _cached_current_monthly_summary(points_model, year, month)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_current_monthly_summary(_points_model: PointsModel, year: int, month: int) -> Dict[str, Any]:
+    """Кэшированная сводка текущего месяца"""
+    return _points_model.get_monthly_summary(year, month)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_past_monthly_summary(_points_model: PointsModel, year: int, month: int) -> Dict[str, Any]:
+    """Кэшированная сводка прошедшего месяца (начисления датируются днем начисления)"""
+    return _points_model.get_monthly_summary(year, month)
+
+
+@st.cache_data(show_spinner=False)
+def _build_activity_df(rows: tuple) -> pd.DataFrame:
+    """Подготовка данных графика по типам активности (activity_type, total_points)"""
+    
+    df_activity = pd.DataFrame(list(rows), columns=['activity_type', 'total_points'])
+    
+    df_activity['display_name'] = df_activity['activity_type'].map(_ACTIVITY_NAMES).fillna(df_activity['activity_type'])
+    
+    return df_activity
+
+
+@st.cache_data(show_spinner=False)
+def _build_daily_df(rows: tuple) -> pd.DataFrame:
+    """Подготовка данных графика динамики по дням (date_earned, points_awarded)"""
+    
+    df_daily = pd.DataFrame(list(rows), columns=['date_earned', 'points_awarded'])
+    # Явный ISO-формат без автоопределения; повторяющиеся даты разбираются один раз
+    df_daily['date_earned'] = pd.to_datetime(df_daily['date_earned'], format='ISO8601', cache=True)
+    
+    # На длинных периодах браузеру отдается не больше _MAX_CHART_POINTS точек
+    return downsample_lttb(df_daily, 'date_earned', 'points_awarded', max_points=_MAX_CHART_POINTS)
+
+
+# Фигуры Plotly кэшируются по исходным строкам: при неизменных данных
+# повторный запуск страницы не строит и не сериализует график заново
+
+@st.cache_data(show_spinner=False)
+def _activity_bar_figure(rows: tuple) -> go.Figure:
+    """График баллов по видам активности (activity_type, total_points)"""
+    
+    fig = px.bar(
+        _build_activity_df(rows),
+        x='display_name',
+        y='total_points',
+        title="Баллы по видам активности",
+        labels={'display_name': 'Тип активности', 'total_points': 'Всего баллов'}
+    )
+    
+    fig.update_layout(showlegend=False)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _daily_line_figure(rows: tuple) -> go.Figure:
+    """График динамики баллов по дням (date_earned, points_awarded)"""
+    
+    return px.line(
+        _build_daily_df(rows),
+        x='date_earned',
+        y='points_awarded',
+        title="Баллы по дням",
+        labels={'date_earned': 'Дата', 'points_awarded': 'Баллы'},
+        markers=True
+    )
+
+
+@st.cache_data(show_spinner=False)
+def _breakdown_pie_figure(rows: tuple) -> go.Figure:
+    """Круговая диаграмма баллов гражданина по типам активности (activity_type, points)"""
+    
+    df_breakdown = pd.DataFrame(list(rows), columns=['activity_type', 'points'])
+    
+    df_breakdown['display_name'] = df_breakdown['activity_type'].map(_ACTIVITY_NAMES).fillna(df_breakdown['activity_type'])
+    
+    return px.pie(
+        df_breakdown,
+        values='points',
+        names='display_name',
+        title="Баллы по типам активности"
+    )
+
+
+def _clear_points_cache():
+    """Сброс кэшированной статистики после изменения баллов"""
+    _cached_quick_stats.clear()
+    _cached_recent_awards.clear()
+    _cached_current_monthly_summary.clear()
+    _cached_past_monthly_summary.clear()
+    _cached_citizen_activity_types.clear()
+
+
 def get_recent_point_awards(points_model: PointsModel, limit: int = 10) -> List[Dict[str, Any]]:
     """Получение недавних начислений баллов"""
     
@@ -1481,88 +1665,66 @@ def get_recent_point_awards(points_model: PointsModel, limit: int = 10) -> List[
     return []
 
 
-def show_point_award_card(award: Dict[str, Any]):
-    """Отображение карточки начисления баллов"""
-    
-    activity_icons = {
-        'meeting_attendance': '🏛️',
-        'subbotnik': '🧹',
-        'community_work': '🤝',
-        'volunteer_work': '❤️',
-        'initiative': '💡'
-    }
+def _award_card_html(award: Dict[str, Any]) -> str:
+    """HTML одной карточки начисления по шаблону _AWARD_CARD_TEMPLATE"""
     
-    icon = activity_icons.get(safe_get(award, 'activity_type', ''), '⭐')
-    points = safe_get(award, 'points', 0)
-    full_name = safe_get(award, 'full_name', 'Неизвестный')
+    points = safe_get(award, 'points', 0) or 0
     description = safe_get(award, 'description', '')
     meeting_title = safe_get(award, 'meeting_title', '')
     created_at = safe_get(award, 'created_at', '')
     
-    color = "green" if points > 0 else "red"
+    details = ''
+    if description:
+        details += _AWARD_DETAIL_TEMPLATE.format(icon='📝', text=html.escape(str(description)))
+    if meeting_title:
+        details += _AWARD_DETAIL_TEMPLATE.format(icon='🏛️', text=html.escape(str(meeting_title)))
     
-    with st.container():
-        col1, col2, col3 = st.columns([3, 1, 1])
-        
-        with col1:
-            st.markdown(f"{icon} **{full_name}**")
-            
-            if description:
-                st.caption(f"📝 {description}")
-            
-            if meeting_title:
-                st.caption(f"🏛️ {meeting_title}")
-        
-        with col2:
-            st.markdown(f"""
-            <div style="
-                color: {color};
-                font-size: 18px;
-                font-weight: bold;
-                text-align: center;
-            ">
-                {'+' if points > 0 else ''}{points} баллов
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            if created_at:
-                try:
-                    st.caption(format_datetime(created_at, 'short'))
-                except:
-                    st.caption(str(created_at))
-        
-        st.markdown("---")
+    if created_at:
+        try:
+            created_at = format_datetime(created_at, 'short')
+        except:
+            created_at = str(created_at)
+    
+    return _AWARD_CARD_TEMPLATE.format(
+        icon=_ACTIVITY_ICONS.get(safe_get(award, 'activity_type', ''), '⭐'),
+        full_name=html.escape(str(safe_get(award, 'full_name', 'Неизвестный'))),
+        details=details,
+        color="green" if points > 0 else "red",
+        sign='+' if points > 0 else '',
+        points=points,
+        created_at=html.escape(str(created_at or ''))
+    )
 
 
-def show_point_record_card(record: Dict[str, Any]):
-    """Отображение карточки записи в истории баллов"""
+def show_point_awards_bulk(awards: List[Dict[str, Any]]):
+    """Отображение списка начислений баллов одним блоком HTML"""
     
-    activity_names = {
-        'meeting_attendance': '🏛️ Заседание',
-        'subbotnik': '🧹 Субботник',
-        'community_work': '🤝 Общественная работа',
-        'volunteer_work': '❤️ Волонтерство',
-        'initiative': '💡 Инициатива'
-    }
+    if not awards:
+        return
     
-    activity_name = activity_names.get(record['activity_type'], record['activity_type'])
-    points = record['points']
+    st.markdown("\n".join(_award_card_html(award) for award in awards), unsafe_allow_html=True)
+
+
+def show_point_award_card(award: Dict[str, Any]):
+    """Отображение карточки начисления баллов"""
+    show_point_awards_bulk([award])
+
+
+def show_points_history_table(history: List[Dict[str, Any]]):
+    """Отображение истории начислений баллов одной таблицей"""
     
-    with st.expander(f"{activity_name} - {points} баллов ({format_date(record['date_earned'])})"):
-        if record['description']:
-            st.write(f"**Описание:** {record['description']}")
-        
-        if record['meeting_title']:
-            st.write(f"**Связанное заседание:** {record['meeting_title']}")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write(f"**Дата:** {format_date(record['date_earned'])}")
-        
-        with col2:
-            st.write(f"**Начислено:** {format_datetime(record['created_at'])}")
+    df_history = pd.DataFrame([dict(record) for record in history])
+    
+    df_history['activity_type'] = df_history['activity_type'].map(_HISTORY_ACTIVITY_LABELS).fillna(df_history['activity_type'])
+    df_history['date_earned'] = pd.to_datetime(df_history['date_earned'], format='ISO8601', errors='coerce')
+    df_history['created_at'] = pd.to_datetime(df_history['created_at'], format='ISO8601', errors='coerce')
+    
+    st.dataframe(
+        df_history.loc[:, list(_HISTORY_COLUMN_CONFIG)],
+        column_config=_HISTORY_COLUMN_CONFIG,
+        use_container_width=True,
+        hide_index=True
+    )
 
 
 def get_bulk_recipients_count(citizen_model: CitizenModel, selection_criteria: str) -> int:
@@ -1586,45 +1748,13 @@ def get_bulk_recipients_list(citizen_model: CitizenModel, selection_criteria: st
     if selection_criteria == "Всем активным гражданам":
         return citizen_model.get_active_citizens()
     elif selection_criteria == "По возрастной группе":
-        # Упрощенная логика - берем первую половину граждан
-        all_citizens = citizen_model.get_active_citizens()
-        return all_citizens[:len(all_citizens)//2]
+        # Упрощенная логика - первая половина граждан с датой рождения (как в подсчете)
+        return citizen_model.get_active_citizens(
+            limit=get_bulk_recipients_count(citizen_model, selection_criteria),
+            birth_date_not_null=True
+        )
     elif selection_criteria == "С определенным количеством баллов":
         # Упрощенная логика - берем каждого третьего
-        all_citizens = citizen_model.get_active_citizens()
-        return all_citizens[::3]
+        return citizen_model.get_active_citizens(every_nth=3)
     else:
         return []
-
-
-def filter_points_history(history: List[Dict], activity_filter: str, period_filter: str) -> List[Dict]:
-    """Фильтрация истории начислений"""
-    
-    filtered = history
-    
-    # Фильтр по типу активности
-    if activity_filter != "Все":
-        filtered = [h for h in filtered if h['activity_type'] == activity_filter]
-    
-    # Фильтр по периоду
-    if period_filter != "Все время":
-        from datetime import datetime, timedelta
-        
-        now = datetime.now()
-        
-        if period_filter == "За месяц":
-            cutoff = now - timedelta(days=30)
-        elif period_filter == "За квартал":
-            cutoff = now - timedelta(days=90)
-        elif period_filter == "За год":
-            cutoff = now - timedelta(days=365)
-        else:
-            cutoff = None
-        
-        if cutoff:
-            filtered = [
-                h for h in filtered 
-                if datetime.fromisoformat(h['created_at'].replace('Z', '+00:00')) >= cutoff
-            ]
-    
-    return filtered
\ No newline at end of file
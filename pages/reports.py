@@ -4,11 +4,14 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 import io
+import heapq
+import operator
+from types import MappingProxyType
 
 from config.database import DatabaseManager
 from models.citizen import CitizenModel
@@ -17,10 +20,107 @@ from models.points import PointsModel
 from models.sms import SMSModel
 from utils.helpers import (
     format_date, format_datetime, create_excel_download_button,
-    show_success_message, show_error_message
+    show_success_message, show_error_message, get_database_manager,
+    downsample_lttb
 )
 from utils.auth import get_current_user_id, has_permission
 
+# Предел точек на трендовых графиках, выше которого данные прореживаются (LTTB)
+_MAX_CHART_POINTS = 2000
+
+# Модели отчетов для кэшированных выборок по ключу
+_REPORT_MODELS = {
+    "citizens": CitizenModel,
+    "meetings": MeetingModel,
+    "sms": SMSModel
+}
+
+# Группы распределений отчета по гражданам: нижние границы групп
+# возраста и баллов (для np.digitize)
+_AGE_EDGES = np.array([18, 31, 51, 71])
+_AGE_LABELS = ["До 18", "18-30", "31-50", "51-70", "70+"]
+_POINTS_EDGES = np.array([1, 51, 101])
+_POINTS_LABELS = ["0 баллов", "1-50", "51-100", "100+"]
+
+# Справочники отображаемых названий (только для чтения, создаются один раз)
+_MEETING_STATUS_NAMES = MappingProxyType({
+    'PLANNED': 'Запланировано',
+    'COMPLETED': 'Проведено',
+    'CANCELLED': 'Отменено'
+})
+_ACTIVITY_FILTER_NAMES = MappingProxyType({
+    'meeting_attendance': 'Заседания',
+    'subbotnik': 'Субботники',
+    'community_work': 'Общественная работа',
+    'volunteer_work': 'Волонтерство'
+})
+_ACTIVITY_CHART_NAMES = MappingProxyType({
+    'meeting_attendance': 'Заседания',
+    'subbotnik': 'Субботники',
+    'community_work': 'Общ. работы',
+    'volunteer_work': 'Волонтерство'
+})
+_SMS_TYPE_BY_FILTER = MappingProxyType({
+    'Обычные': 'REGULAR',
+    'Экстренные': 'EMERGENCY',
+    'Напоминания': 'REMINDER'
+})
+_SMS_TYPE_CHART_NAMES = MappingProxyType({
+    'REGULAR': 'Обычные',
+    'EMERGENCY': 'Экстренные',
+    'REMINDER': 'Напоминания'
+})
+_SMS_TYPE_DISPLAY_NAMES = MappingProxyType({
+    'REGULAR': 'Обычная',
+    'EMERGENCY': 'Экстренная',
+    'REMINDER': 'Напоминание'
+})
+
+# Колонки таблиц отчетов: исходное поле -> заголовок (в порядке отображения)
+_CITIZEN_REPORT_COLUMNS = MappingProxyType({
+    'full_name': 'ФИО',
+    'birth_date': 'Дата рождения',
+    'address': 'Адрес',
+    'phone': 'Телефон',
+    'total_points': 'Баллы'
+})
+_MEETING_REPORT_COLUMNS = MappingProxyType({
+    'title': 'Название',
+    'meeting_date': 'Дата',
+    'meeting_time': 'Время',
+    'location': 'Место',
+    'status': 'Статус',
+    'attendance_count': 'Присутствовали',
+    'total_invited': 'Приглашено',
+    'attendance_rate': 'Посещаемость %'
+})
+_SMS_REPORT_COLUMNS = MappingProxyType({
+    'title': 'Название',
+    'campaign_type': 'Тип',
+    'created_at': 'Создано',
+    'sent_count': 'Отправлено',
+    'delivered_count': 'Доставлено',
+    'failed_count': 'Ошибки',
+    'delivery_rate': 'Доставляемость %'
+})
+
+# Поля кампаний, из которых строится таблица отчета по SMS
+_SMS_CAMPAIGN_FIELDS = ('title', 'campaign_type', 'created_at', 'sent_count', 'delivered_count', 'failed_count')
+_SMS_CAMPAIGN_GETTER = operator.itemgetter(*_SMS_CAMPAIGN_FIELDS)
+
+# Готовые макеты графиков отчета по SMS (копируются в каждую фигуру)
+_SMS_TYPE_PIE_LAYOUT = go.Layout(title="Кампании по типам")
+_SMS_DAILY_BAR_LAYOUT = go.Layout(title="SMS по дням", xaxis_type="date")
+
+# Условия фильтра SMS-кампаний по доставляемости (проверяются в SQL)
+_DELIVERY_RATE_SQL = "COALESCE(delivered_count, 0) * 100.0 / sent_count"
+_DELIVERY_FILTER_CONDITIONS = {
+    "Высокая (>90%)": f"sent_count > 0 AND {_DELIVERY_RATE_SQL} > 90",
+    "Средняя (50-90%)": f"sent_count > 0 AND {_DELIVERY_RATE_SQL} BETWEEN 50 AND 90",
+    "Низкая (<50%)": f"sent_count > 0 AND {_DELIVERY_RATE_SQL} < 50"
+}
+
+
 def show_reports_page():
     """Главная функция страницы отчетов"""
     
@@ -33,7 +133,7 @@ def show_reports_page():
         return
     
     # Инициализируем модели
-    db = DatabaseManager()
+    db = get_database_manager()
     citizen_model = CitizenModel(db)
     meeting_model = MeetingModel(db)
     points_model = PointsModel(db)
@@ -63,7 +163,7 @@ def show_reports_page():
         # Быстрая информация о системе
         st.markdown("### ℹ️ Информация о системе")
         
-        db_info = db.get_database_info()
+        db_info = _cached_database_info()
         
         st.metric("💾 Размер БД", f"{db_info.get('file_size_mb', 0)} МБ")
         st.metric("👥 Граждан", db_info.get('citizens_count', 0))
@@ -107,62 +207,66 @@ def show_reports_dashboard(
     
     st.markdown("### 📊 Общая сводка системы")
     
+    counts = _cached_dashboard_counts()
+    
     # Основные метрики
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_citizens = citizen_model.count("is_active = 1")
+        total_citizens = counts.get('active_citizens', 0)
         st.metric("👥 Активных граждан", total_citizens)
         
         # Рост за месяц
-        new_citizens = citizen_model.count("is_active = 1 AND created_at >= date('now', '-30 days')")
+        new_citizens = counts.get('new_citizens_30d', 0)
         st.metric("➕ Новых за месяц", new_citizens)
     
     with col2:
-        total_meetings = meeting_model.count()
+        total_meetings = counts.get('total_meetings', 0)
         st.metric("🏛️ Всего заседаний", total_meetings)
         
-        completed_meetings = meeting_model.count("status = 'COMPLETED'")
+        completed_meetings = counts.get('completed_meetings', 0)
         completion_rate = (completed_meetings / total_meetings * 100) if total_meetings > 0 else 0
         st.metric("✅ Завершено", f"{completion_rate:.1f}%")
     
     with col3:
-        total_points = points_model.count()
+        total_points = counts.get('total_points_records', 0)
         st.metric("⭐ Начислений баллов", total_points)
         
-        monthly_points = points_model.count("date_earned >= date('now', '-30 days')")
+        monthly_points = counts.get('points_records_30d', 0)
         st.metric("📈 За месяц", monthly_points)
     
     with col4:
-        total_sms = sms_model.count()
+        total_sms = counts.get('total_sms_campaigns', 0)
         st.metric("📱 SMS кампаний", total_sms)
         
-        monthly_sms = sms_model.count("created_at >= date('now', '-30 days')")
+        monthly_sms = counts.get('sms_campaigns_30d', 0)
         st.metric("📤 За месяц", monthly_sms)
     
     st.markdown("---")
     
-    # Графики активности
-    col1, col2 = st.columns(2)
+    # Графики активности: по вкладке на график, данные трендов кэшируются,
+    # поэтому переключение вкладок не обращается к БД повторно
+    tab_attendance, tab_points = st.tabs(["📈 Посещаемость", "⭐ Баллы"])
     
-    with col1:
+    with tab_attendance:
         # График посещаемости заседаний
         st.markdown("#### 📈 Динамика посещаемости заседаний")
         
-        attendance_data = get_attendance_trend_data(meeting_model)
+        df_attendance = get_attendance_trend_data(meeting_model)
         
-        if attendance_data:
-            df_attendance = pd.DataFrame(attendance_data)
+        if not df_attendance.empty:
+            df_attendance = downsample_lttb(df_attendance, 'date', 'attendance_rate', max_points=_MAX_CHART_POINTS)
             
-            fig = px.line(
-                df_attendance,
-                x='date',
-                y='attendance_rate',
-                title="Посещаемость заседаний (%)",
-                markers=True
-            )
+            # WebGL-трасса вместо SVG: длинные ряды отрисовываются без подтормаживания
+            fig = go.Figure(go.Scattergl(
+                x=df_attendance['date'],
+                y=df_attendance['attendance_rate'],
+                mode='lines+markers',
+                name="Посещаемость"
+            ))
             
             fig.update_layout(
+                title="Посещаемость заседаний (%)",
                 yaxis_title="Посещаемость (%)",
                 xaxis_title="Дата заседания"
             )
@@ -171,23 +275,24 @@ def show_reports_dashboard(
         else:
             st.info("📊 Недостаточно данных для графика")
     
-    with col2:
+    with tab_points:
         # График активности граждан (баллы)
         st.markdown("#### ⭐ Динамика начисления баллов")
         
-        points_trend_data = get_points_trend_data(points_model)
+        df_points = get_points_trend_data(points_model)
         
-        if points_trend_data:
-            df_points = pd.DataFrame(points_trend_data)
+        if not df_points.empty:
+            df_points = downsample_lttb(df_points, 'date', 'points_awarded', max_points=_MAX_CHART_POINTS)
             
-            fig = px.bar(
-                df_points,
-                x='date',
-                y='points_awarded',
-                title="Баллы по дням"
-            )
+            # У столбцов нет WebGL-варианта; объем ограничен прореживанием выше
+            fig = go.Figure(go.Bar(
+                x=df_points['date'],
+                y=df_points['points_awarded'],
+                name="Баллы"
+            ))
             
             fig.update_layout(
+                title="Баллы по дням",
                 yaxis_title="Баллы",
                 xaxis_title="Дата"
             )
@@ -257,19 +362,22 @@ def show_citizens_report(citizen_model: CitizenModel):
     
     # Кнопка генерации отчета
     if st.button("📊 Сгенерировать отчет", use_container_width=True, type="primary"):
-        # Формируем условия поиска
+        # Формируем условия поиска (значения всегда передаются параметрами,
+        # чтобы текст SQL не зависел от констант)
         where_conditions = []
         params = []
         
         if not include_inactive:
-            where_conditions.append("is_active = 1")
+            where_conditions.append("is_active = ?")
+            params.append(1)
         
         if phone_filter:
-            where_conditions.append("phone IS NOT NULL AND phone != ''")
+            where_conditions.append("phone IS NOT NULL AND phone <> ?")
+            params.append('')
         
         # Получаем данные
         where_clause = " AND ".join(where_conditions) if where_conditions else ""
-        citizens = citizen_model.get_all(where_clause, tuple(params), "full_name")
+        citizens = _cached_get_all("citizens", where_clause, tuple(params), "full_name")
         
         if not citizens:
             st.warning("📭 Нет данных по заданным критериям")
@@ -278,22 +386,26 @@ def show_citizens_report(citizen_model: CitizenModel):
         # Отображаем статистику
         st.success(f"✅ Найдено граждан: {len(citizens)}")
         
+        # Таблица строится сразу: по ней векторно считаются метрики
+        df_citizens = pd.DataFrame.from_records(citizens, columns=citizens[0].keys())
+        citizen_points = df_citizens['total_points'].fillna(0)
+        
         # Основные метрики отчета
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("👥 Всего граждан", len(citizens))
+            st.metric("👥 Всего граждан", len(df_citizens))
         
         with col2:
-            with_phones = sum(1 for c in citizens if c['phone'])
+            with_phones = int(df_citizens['phone'].fillna('').astype(bool).sum())
             st.metric("📱 С телефонами", with_phones)
         
         with col3:
-            with_points = sum(1 for c in citizens if c['total_points'] and c['total_points'] > 0)
+            with_points = int((citizen_points > 0).sum())
             st.metric("⭐ С баллами", with_points)
         
         with col4:
-            total_points = sum(c['total_points'] or 0 for c in citizens)
+            total_points = int(citizen_points.sum())
             st.metric("🏆 Общие баллы", total_points)
         
         # Графики
@@ -301,43 +413,29 @@ def show_citizens_report(citizen_model: CitizenModel):
         
         with col1:
             # Возрастное распределение
-            age_distribution = calculate_age_distribution(citizens)
+            age_distribution = calculate_age_distribution(df_citizens)
             if age_distribution:
-                fig = px.pie(
-                    values=list(age_distribution.values()),
-                    names=list(age_distribution.keys()),
-                    title="Распределение по возрасту"
+                fig = go.Figure(
+                    go.Pie(labels=list(age_distribution.keys()), values=list(age_distribution.values())),
+                    layout=go.Layout(title="Распределение по возрасту")
                 )
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             # Распределение по баллам
-            points_distribution = calculate_points_distribution(citizens)
+            points_distribution = calculate_points_distribution(df_citizens)
             if points_distribution:
-                fig = px.bar(
-                    x=list(points_distribution.keys()),
-                    y=list(points_distribution.values()),
-                    title="Распределение по баллам"
+                fig = go.Figure(
+                    go.Bar(x=list(points_distribution.keys()), y=list(points_distribution.values())),
+                    layout=go.Layout(title="Распределение по баллам")
                 )
                 st.plotly_chart(fig, use_container_width=True)
         
         # Таблица с данными
         st.markdown("#### 📋 Детальные данные")
         
-        df_citizens = pd.DataFrame([dict(c) for c in citizens])
-        
         # Переименовываем колонки
-        column_mapping = {
-            'full_name': 'ФИО',
-            'birth_date': 'Дата рождения',
-            'address': 'Адрес',
-            'phone': 'Телефон',
-            'total_points': 'Баллы',
-            'registration_date': 'Дата регистрации'
-        }
-        
-        display_columns = ['ФИО', 'Дата рождения', 'Адрес', 'Телефон', 'Баллы']
-        df_display = df_citizens.rename(columns=column_mapping)[display_columns]
+        df_display = df_citizens[list(_CITIZEN_REPORT_COLUMNS)].rename(columns=_CITIZEN_REPORT_COLUMNS)
         
         st.dataframe(df_display, use_container_width=True, hide_index=True)
         
@@ -352,10 +450,13 @@ def show_citizens_report(citizen_model: CitizenModel):
                     "📥 Скачать отчет (Excel)"
                 )
             elif export_format == "CSV":
-                csv_data = df_display.to_csv(index=False, encoding='utf-8')
+                # Пишем порциями сразу в байтовый буфер, без промежуточной строки
+                buffer = io.BytesIO()
+                df_display.to_csv(buffer, index=False, encoding='utf-8', chunksize=10_000)
+                buffer.seek(0)
                 st.download_button(
                     label="📥 Скачать отчет (CSV)",
-                    data=csv_data,
+                    data=buffer,
                     file_name=f"отчет_граждане_{timestamp}.csv",
                     mime="text/csv"
                 )
@@ -394,13 +495,9 @@ def show_meetings_report(meeting_model: MeetingModel):
     with col2:
         status_filter = st.multiselect(
             "Статус заседаний",
-            ["PLANNED", "COMPLETED", "CANCELLED"],
+            list(_MEETING_STATUS_NAMES),
             default=["COMPLETED"],
-            format_func=lambda x: {
-                "PLANNED": "Запланировано",
-                "COMPLETED": "Проведено", 
-                "CANCELLED": "Отменено"
-            }[x]
+            format_func=lambda x: _MEETING_STATUS_NAMES[x]
         )
         
         min_attendance = st.slider(
@@ -428,42 +525,56 @@ def show_meetings_report(meeting_model: MeetingModel):
             where_conditions.append(f"status IN ({status_placeholders})")
             params.extend(status_filter)
         
+        # Фильтр по посещаемости
+        if min_attendance > 0:
+            where_conditions.append("total_invited > 0 AND attendance_count * 100.0 / total_invited >= ?")
+            params.append(min_attendance)
+        
         where_clause = " AND ".join(where_conditions)
-        meetings = meeting_model.get_all(where_clause, tuple(params), "meeting_date DESC")
+        meetings = _cached_get_all("meetings", where_clause, tuple(params), "meeting_date DESC")
         
         if not meetings:
             st.warning("📭 Нет заседаний по заданным критериям")
             return
         
-        # Фильтр по посещаемости
-        if min_attendance > 0:
-            filtered_meetings = []
-            for meeting in meetings:
-                if meeting['total_invited'] > 0:
-                    attendance_rate = (meeting['attendance_count'] / meeting['total_invited']) * 100
-                    if attendance_rate >= min_attendance:
-                        filtered_meetings.append(meeting)
-            meetings = filtered_meetings
-        
         st.success(f"✅ Найдено заседаний: {len(meetings)}")
         
+        df_meetings = pd.DataFrame.from_records(meetings, columns=list(meetings[0].keys()))
+        
+        # Статус хранится как категория: перевод для отображения
+        # переименовывает только три категории, а не каждую строку
+        df_meetings['status'] = pd.Categorical(
+            df_meetings['status'], categories=list(_MEETING_STATUS_NAMES)
+        )
+        
+        # Числовые колонки извлекаются один раз; метрики и проценты
+        # считаются векторно по массивам (NULL -> 0, как раньше)
+        total_invited = df_meetings['total_invited'].fillna(0).to_numpy(dtype='float64')
+        attended = df_meetings['attendance_count'].fillna(0).to_numpy(dtype='float64')
+        
+        # Процент посещаемости по заседаниям (0 при отсутствии приглашенных)
+        attendance_rates = np.divide(
+            attended * 100, total_invited,
+            out=np.zeros_like(total_invited), where=total_invited > 0
+        )
+        
         # Основные метрики
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("🏛️ Всего заседаний", len(meetings))
+            st.metric("🏛️ Всего заседаний", len(df_meetings))
         
         with col2:
-            total_participants = sum(m['total_invited'] or 0 for m in meetings)
+            total_participants = int(total_invited.sum())
             st.metric("👥 Всего участников", total_participants)
         
         with col3:
-            total_attended = sum(m['attendance_count'] or 0 for m in meetings)
+            total_attended = int(attended.sum())
             avg_attendance = (total_attended / total_participants * 100) if total_participants > 0 else 0
             st.metric("📊 Средняя посещаемость", f"{avg_attendance:.1f}%")
         
         with col4:
-            completed_count = sum(1 for m in meetings if m['status'] == 'COMPLETED')
+            completed_count = int((df_meetings['status'] == 'COMPLETED').sum())
             st.metric("✅ Завершено", completed_count)
         
         # Графики
@@ -472,75 +583,41 @@ def show_meetings_report(meeting_model: MeetingModel):
             
             with col1:
                 # График посещаемости по заседаниям
-                meeting_names = [m['title'][:20] + "..." if len(m['title']) > 20 else m['title'] for m in meetings]
-                attendance_rates = [
-                    (m['attendance_count'] / m['total_invited'] * 100) if m['total_invited'] > 0 else 0
-                    for m in meetings
-                ]
+                titles = df_meetings['title'].astype(str)
+                meeting_names = titles.where(titles.str.len() <= 20, titles.str[:20] + "...")
                 
-                fig = px.bar(
-                    x=meeting_names,
-                    y=attendance_rates,
-                    title="Посещаемость по заседаниям (%)"
+                fig = go.Figure(
+                    go.Bar(x=meeting_names, y=attendance_rates),
+                    layout=go.Layout(title="Посещаемость по заседаниям (%)", xaxis_tickangle=-45)
                 )
-                fig.update_layout(xaxis_tickangle=-45)
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 # Статистика по статусам
-                status_counts = {}
-                for meeting in meetings:
-                    status = meeting['status']
-                    status_counts[status] = status_counts.get(status, 0) + 1
-                
-                status_names = {
-                    'PLANNED': 'Запланировано',
-                    'COMPLETED': 'Проведено',
-                    'CANCELLED': 'Отменено'
-                }
+                # Подсчет по категориям статуса; пустые статусы в диаграмму не попадают
+                status_counts = df_meetings['status'].value_counts(sort=False)
+                status_counts = status_counts[status_counts > 0]
                 
-                labels = [status_names.get(k, k) for k in status_counts.keys()]
-                values = list(status_counts.values())
+                labels = [_MEETING_STATUS_NAMES.get(k, k) for k in status_counts.index]
+                values = status_counts.tolist()
                 
-                fig = px.pie(
-                    values=values,
-                    names=labels,
-                    title="Распределение по статусам"
+                fig = go.Figure(
+                    go.Pie(labels=labels, values=values),
+                    layout=go.Layout(title="Распределение по статусам")
                 )
                 st.plotly_chart(fig, use_container_width=True)
         
         # Детальная таблица
         st.markdown("#### 📋 Детальные данные заседаний")
         
-        df_meetings = pd.DataFrame([dict(m) for m in meetings])
-        
         # Добавляем процент посещаемости
-        df_meetings['attendance_rate'] = df_meetings.apply(
-            lambda row: (row['attendance_count'] / row['total_invited'] * 100) 
-            if row['total_invited'] > 0 else 0, axis=1
-        ).round(1)
+        df_meetings['attendance_rate'] = np.round(attendance_rates, 1)
         
         # Переименовываем колонки
-        display_columns = {
-            'title': 'Название',
-            'meeting_date': 'Дата',
-            'meeting_time': 'Время',
-            'location': 'Место',
-            'status': 'Статус',
-            'attendance_count': 'Присутствовали',
-            'total_invited': 'Приглашено',
-            'attendance_rate': 'Посещаемость %'
-        }
-        
-        df_display = df_meetings[list(display_columns.keys())].rename(columns=display_columns)
+        df_display = df_meetings[list(_MEETING_REPORT_COLUMNS)].rename(columns=_MEETING_REPORT_COLUMNS)
         
         # Переводим статусы
-        status_mapping = {
-            'PLANNED': 'Запланировано',
-            'COMPLETED': 'Проведено',
-            'CANCELLED': 'Отменено'
-        }
-        df_display['Статус'] = df_display['Статус'].map(status_mapping)
+        df_display['Статус'] = df_display['Статус'].cat.rename_categories(_MEETING_STATUS_NAMES)
         
         st.dataframe(df_display, use_container_width=True, hide_index=True)
         
@@ -578,14 +655,9 @@ def show_points_report(points_model: PointsModel):
     with col2:
         activity_filter = st.multiselect(
             "Типы активности",
-            ["meeting_attendance", "subbotnik", "community_work", "volunteer_work"],
+            list(_ACTIVITY_FILTER_NAMES),
             default=[],
-            format_func=lambda x: {
-                "meeting_attendance": "Заседания",
-                "subbotnik": "Субботники",
-                "community_work": "Общественная работа",
-                "volunteer_work": "Волонтерство"
-            }.get(x, x)
+            format_func=lambda x: _ACTIVITY_FILTER_NAMES.get(x, x)
         )
         
         min_points = st.number_input(
@@ -603,10 +675,11 @@ def show_points_report(points_model: PointsModel):
     # Генерация отчета
     if st.button("📊 Сгенерировать отчет", use_container_width=True, type="primary"):
         # Получаем статистику активности
-        activity_stats = points_model.get_activity_statistics(report_period)
+        today_iso = date.today().isoformat()
+        activity_stats = _cached_activity_statistics(report_period, today_iso)
         
         # Получаем рейтинг
-        leaderboard = points_model.get_leaderboard(limit=top_count, period_days=report_period)
+        leaderboard = _cached_leaderboard(top_count, report_period, today_iso)
         
         if min_points > 0:
             leaderboard = [
@@ -616,6 +689,10 @@ def show_points_report(points_model: PointsModel):
         
         st.success(f"✅ Отчет по системе баллов за {report_period} дней")
         
+        # Рейтинг переводится в DataFrame один раз для топа и полной таблицы
+        if leaderboard:
+            df_leaderboard = pd.DataFrame.from_records(leaderboard, columns=list(leaderboard[0].keys()))
+        
         # Основные метрики
         totals = activity_stats.get('totals', {})
         
@@ -644,23 +721,13 @@ def show_points_report(points_model: PointsModel):
                 if activity_data:
                     st.markdown("#### 📊 Активность по типам")
                     
-                    activity_names = {
-                        'meeting_attendance': 'Заседания',
-                        'subbotnik': 'Субботники',
-                        'community_work': 'Общ. работы',
-                        'volunteer_work': 'Волонтерство'
-                    }
-                    
-                    df_activity = pd.DataFrame(activity_data)
-                    df_activity['display_name'] = df_activity['activity_type'].map(
-                        lambda x: activity_names.get(x, x)
-                    )
+                    # Несколько строк агрегатов передаются в Plotly напрямую, без DataFrame
+                    labels = [_ACTIVITY_CHART_NAMES.get(row['activity_type'], row['activity_type']) for row in activity_data]
+                    values = [row['total_points'] for row in activity_data]
                     
-                    fig = px.pie(
-                        df_activity,
-                        values='total_points',
-                        names='display_name',
-                        title="Распределение баллов по типам"
+                    fig = go.Figure(
+                        go.Pie(labels=labels, values=values),
+                        layout=go.Layout(title="Распределение баллов по типам")
                     )
                     st.plotly_chart(fig, use_container_width=True)
             
@@ -669,25 +736,23 @@ def show_points_report(points_model: PointsModel):
                 if leaderboard:
                     st.markdown("#### 🏆 Топ активных граждан")
                     
-                    df_top = pd.DataFrame([dict(citizen) for citizen in leaderboard[:10]])
-                    
                     # Определяем колонку с баллами
                     points_column = 'total_points' if report_period is None else 'period_points'
-                    if points_column not in df_top.columns:
+                    if points_column not in leaderboard[0].keys():
                         points_column = 'total_points'  # fallback
                     
-                    df_display = df_top[['full_name', points_column]].copy()
-                    df_display.columns = ['ФИО', 'Баллы']
-                    df_display.index = range(1, len(df_display) + 1)
+                    # Десять строк передаются списком словарей, без DataFrame
+                    top_rows = [
+                        {'Место': position, 'ФИО': citizen['full_name'], 'Баллы': citizen[points_column]}
+                        for position, citizen in enumerate(leaderboard[:10], start=1)
+                    ]
                     
-                    st.dataframe(df_display, use_container_width=True)
+                    st.dataframe(top_rows, use_container_width=True, hide_index=True)
         
         # Детальная таблица
         if leaderboard:
             st.markdown("#### 📋 Полный рейтинг")
             
-            df_leaderboard = pd.DataFrame([dict(citizen) for citizen in leaderboard])
-            
             # Добавляем позицию
             df_leaderboard['position'] = range(1, len(df_leaderboard) + 1)
             
@@ -775,37 +840,22 @@ def show_sms_report(sms_model: SMSModel):
         
         # Фильтр по типу
         if campaign_type != "Все":
-            type_map = {
-                "Обычные": "REGULAR",
-                "Экстренные": "EMERGENCY",
-                "Напоминания": "REMINDER"
-            }
-            sms_type = type_map.get(campaign_type)
+            sms_type = _SMS_TYPE_BY_FILTER.get(campaign_type)
             if sms_type:
                 where_conditions.append("campaign_type = ?")
                 params.append(sms_type)
         
-        where_clause = " AND ".join(where_conditions)
-        campaigns = sms_model.get_all(where_clause, tuple(params), "created_at DESC")
-        
         # Фильтр по количеству получателей
         if min_recipients > 0:
-            campaigns = [c for c in campaigns if (c['sent_count'] or 0) >= min_recipients]
+            where_conditions.append("COALESCE(sent_count, 0) >= ?")
+            params.append(min_recipients)
         
         # Фильтр по доставляемости
-        if delivery_filter != "Все":
-            filtered_campaigns = []
-            for campaign in campaigns:
-                if campaign['sent_count'] and campaign['sent_count'] > 0:
-                    delivery_rate = (campaign['delivered_count'] or 0) / campaign['sent_count'] * 100
-                    
-                    if delivery_filter == "Высокая (>90%)" and delivery_rate > 90:
-                        filtered_campaigns.append(campaign)
-                    elif delivery_filter == "Средняя (50-90%)" and 50 <= delivery_rate <= 90:
-                        filtered_campaigns.append(campaign)
-                    elif delivery_filter == "Низкая (<50%)" and delivery_rate < 50:
-                        filtered_campaigns.append(campaign)
-            campaigns = filtered_campaigns
+        if delivery_filter in _DELIVERY_FILTER_CONDITIONS:
+            where_conditions.append(_DELIVERY_FILTER_CONDITIONS[delivery_filter])
+        
+        where_clause = " AND ".join(where_conditions)
+        campaigns = _cached_get_all("sms", where_clause, tuple(params), "created_at DESC")
         
         if not campaigns:
             st.warning("📭 Нет SMS-кампаний по заданным критериям")
@@ -813,12 +863,23 @@ def show_sms_report(sms_model: SMSModel):
         
         st.success(f"✅ Найдено кампаний: {len(campaigns)}")
         
+        # Таблица собирается только из нужных полей: один проход itemgetter
+        # по кампаниям вместо отдельного прохода на каждое поле
+        df_campaigns = pd.DataFrame.from_records(
+            list(map(_SMS_CAMPAIGN_GETTER, campaigns)),
+            columns=list(_SMS_CAMPAIGN_FIELDS)
+        )
+        
+        # Счетчики извлекаются один раз; итоги считаются по массивам (NULL -> 0)
+        sent = df_campaigns['sent_count'].fillna(0).to_numpy(dtype='float64')
+        delivered = df_campaigns['delivered_count'].fillna(0).to_numpy(dtype='float64')
+        
         # Основные метрики
         col1, col2, col3, col4 = st.columns(4)
         
-        total_sent = sum(c['sent_count'] or 0 for c in campaigns)
-        total_delivered = sum(c['delivered_count'] or 0 for c in campaigns)
-        total_failed = sum(c['failed_count'] or 0 for c in campaigns)
+        total_sent = int(sent.sum())
+        total_delivered = int(delivered.sum())
+        total_failed = int(df_campaigns['failed_count'].fillna(0).sum())
         avg_delivery_rate = (total_delivered / total_sent * 100) if total_sent > 0 else 0
         
         with col1:
@@ -835,88 +896,61 @@ def show_sms_report(sms_model: SMSModel):
             st.metric("❌ Ошибки", total_failed)
         
         # Графики
+        sms_aggregates = _cached_sms_aggregates(where_clause, tuple(params))
+        
         col1, col2 = st.columns(2)
         
         with col1:
-            # Статистика по типам
-            type_stats = {}
-            for campaign in campaigns:
-                campaign_type = campaign['campaign_type']
-                type_stats[campaign_type] = type_stats.get(campaign_type, 0) + 1
+            # Статистика по типам (агрегация в SQL с теми же фильтрами)
+            type_stats = sms_aggregates['types']
             
             if type_stats:
-                type_names = {
-                    'REGULAR': 'Обычные',
-                    'EMERGENCY': 'Экстренные',
-                    'REMINDER': 'Напоминания'
-                }
-                
-                labels = [type_names.get(k, k) for k in type_stats.keys()]
-                values = list(type_stats.values())
+                labels = [_SMS_TYPE_CHART_NAMES.get(row['campaign_type'], row['campaign_type']) for row in type_stats]
+                values = [row['campaigns_count'] for row in type_stats]
                 
-                fig = px.pie(
-                    values=values,
-                    names=labels,
-                    title="Кампании по типам"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                fig = go.Figure(go.Pie(labels=labels, values=values), layout=_SMS_TYPE_PIE_LAYOUT)
+                st.plotly_chart(fig, use_container_width=True, key="sms_type_pie")
         
         with col2:
-            # Динамика по дням
-            daily_stats = {}
-            for campaign in campaigns:
-                day = campaign['created_at'][:10]  # YYYY-MM-DD
-                daily_stats[day] = daily_stats.get(day, 0) + (campaign['sent_count'] or 0)
+            # Динамика по дням (уже сгруппирована и отсортирована в SQL)
+            daily_stats = sms_aggregates['daily']
             
             if daily_stats:
-                df_daily = pd.DataFrame([
-                    {'date': k, 'sms_count': v} for k, v in daily_stats.items()
-                ])
-                df_daily['date'] = pd.to_datetime(df_daily['date'])
-                df_daily = df_daily.sort_values('date')
-                
-                fig = px.bar(
-                    df_daily,
-                    x='date',
-                    y='sms_count',
-                    title="SMS по дням"
+                # Ось X типа date сама разбирает строки YYYY-MM-DD
+                fig = go.Figure(
+                    go.Bar(
+                        x=[row['day'] for row in daily_stats],
+                        y=[row['sms_count'] for row in daily_stats]
+                    ),
+                    layout=_SMS_DAILY_BAR_LAYOUT
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, key="sms_daily_bar")
         
         # Детальная таблица
         st.markdown("#### 📋 Детальные данные кампаний")
         
-        df_campaigns = pd.DataFrame([dict(c) for c in campaigns])
-        
-        # Добавляем процент доставляемости
-        df_campaigns['delivery_rate'] = df_campaigns.apply(
-            lambda row: (row['delivered_count'] / row['sent_count'] * 100) 
-            if row['sent_count'] and row['sent_count'] > 0 else 0, axis=1
-        ).round(1)
+        # Добавляем процент доставляемости (векторно; 0 при отсутствии отправленных)
+        delivery_rates = np.divide(
+            delivered * 100, sent,
+            out=np.zeros_like(sent), where=sent > 0
+        )
+        df_campaigns['delivery_rate'] = np.round(delivery_rates, 1)
         
         # Переименовываем колонки
-        display_columns = {
-            'title': 'Название',
-            'campaign_type': 'Тип',
-            'created_at': 'Создано',
-            'sent_count': 'Отправлено',
-            'delivered_count': 'Доставлено',
-            'failed_count': 'Ошибки',
-            'delivery_rate': 'Доставляемость %'
-        }
-        
-        df_display = df_campaigns[list(display_columns.keys())].rename(columns=display_columns)
+        # df_campaigns уже содержит ровно колонки таблицы в нужном порядке,
+        # поэтому выборка не нужна, а переименование обходится без копии данных
+        df_display = df_campaigns.rename(columns=_SMS_REPORT_COLUMNS, copy=False)
         
         # Переводим типы
-        type_mapping = {
-            'REGULAR': 'Обычная',
-            'EMERGENCY': 'Экстренная',
-            'REMINDER': 'Напоминание'
-        }
-        df_display['Тип'] = df_display['Тип'].map(type_mapping)
+        df_display['Тип'] = pd.Categorical(
+            df_display['Тип'], categories=list(_SMS_TYPE_DISPLAY_NAMES)
+        ).rename_categories(_SMS_TYPE_DISPLAY_NAMES)
         
         # Форматируем дату
-        df_display['Создано'] = pd.to_datetime(df_display['Создано']).dt.strftime('%Y-%m-%d %H:%M')
+        # created_at хранится в ISO-формате (с 'T' или пробелом) - без угадывания формата
+        df_display['Создано'] = pd.to_datetime(
+            df_display['Создано'], format='ISO8601', cache=True
+        ).dt.strftime('%Y-%m-%d %H:%M')
         
         st.dataframe(df_display, use_container_width=True, hide_index=True)
         
@@ -931,10 +965,13 @@ def show_sms_report(sms_model: SMSModel):
                     "📥 Скачать отчет по SMS"
                 )
             else:  # CSV
-                csv_data = df_display.to_csv(index=False, encoding='utf-8')
+                # Пишем порциями сразу в байтовый буфер, без промежуточной строки
+                buffer = io.BytesIO()
+                df_display.to_csv(buffer, index=False, encoding='utf-8', chunksize=10_000)
+                buffer.seek(0)
                 st.download_button(
                     label="📥 Скачать отчет (CSV)",
-                    data=csv_data,
+                    data=buffer,
                     file_name=f"отчет_sms_{timestamp}.csv",
                     mime="text/csv"
                 )
@@ -978,13 +1015,15 @@ def show_analytics_report(citizen_model: CitizenModel, meeting_model: MeetingMod
         # Получаем данные для анализа
         start_date = date.today() - timedelta(days=analysis_period)
         
-        # Основные метрики для анализа
+        # Основные метрики для анализа (все счетчики одним запросом)
+        counts = _cached_period_counts(start_date.isoformat())
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
             # Активность граждан
-            active_citizens = citizen_model.count("is_active = 1 AND total_points > 0")
-            total_citizens = citizen_model.count("is_active = 1")
+            active_citizens = counts.get('citizens_with_points', 0)
+            total_citizens = counts.get('total_citizens', 0)
             activity_rate = (active_citizens / total_citizens * 100) if total_citizens > 0 else 0
             
             st.metric("👥 Уровень активности", f"{activity_rate:.1f}%")
@@ -992,12 +1031,8 @@ def show_analytics_report(citizen_model: CitizenModel, meeting_model: MeetingMod
         
         with col2:
             # Эффективность заседаний
-            completed_meetings = meeting_model.count(
-                f"status = 'COMPLETED' AND meeting_date >= '{start_date.isoformat()}'"
-            )
-            total_meetings = meeting_model.count(
-                f"meeting_date >= '{start_date.isoformat()}'"
-            )
+            completed_meetings = counts.get('completed_meetings', 0)
+            total_meetings = counts.get('total_meetings', 0)
             completion_rate = (completed_meetings / total_meetings * 100) if total_meetings > 0 else 0
             
             st.metric("🏛️ Эффективность заседаний", f"{completion_rate:.1f}%")
@@ -1005,7 +1040,7 @@ def show_analytics_report(citizen_model: CitizenModel, meeting_model: MeetingMod
         
         with col3:
             # Динамика начислений
-            recent_points = points_model.count(f"date_earned >= '{start_date.isoformat()}'")
+            recent_points = counts.get('points_records', 0)
             points_per_day = recent_points / analysis_period if analysis_period > 0 else 0
             
             st.metric("⭐ Активность (баллы/день)", f"{points_per_day:.1f}")
@@ -1074,38 +1109,30 @@ def show_comprehensive_report(
             st.markdown("---")
             st.markdown("## 📋 Краткая сводка")
             
-            # Ключевые показатели
+            # Ключевые показатели (все счетчики одним запросом)
+            counts = _cached_period_counts(start_date.isoformat())
+            
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                total_citizens = citizen_model.count("is_active = 1")
-                new_citizens = citizen_model.count(
-                    f"is_active = 1 AND created_at >= '{start_date.isoformat()}'"
-                )
+                total_citizens = counts.get('total_citizens', 0)
+                new_citizens = counts.get('new_citizens', 0)
                 
                 st.metric("👥 Граждан", total_citizens, delta=f"+{new_citizens}")
             
             with col2:
-                total_meetings = meeting_model.count(
-                    f"meeting_date >= '{start_date.isoformat()}'"
-                )
-                completed = meeting_model.count(
-                    f"meeting_date >= '{start_date.isoformat()}' AND status = 'COMPLETED'"
-                )
+                total_meetings = counts.get('total_meetings', 0)
+                completed = counts.get('completed_meetings', 0)
                 
                 st.metric("🏛️ Заседаний", total_meetings, delta=f"{completed} завершено")
             
             with col3:
-                total_points = points_model.count(
-                    f"date_earned >= '{start_date.isoformat()}'"
-                )
+                total_points = counts.get('points_records', 0)
                 
                 st.metric("⭐ Начислений", total_points)
             
             with col4:
-                total_sms = sms_model.count(
-                    f"created_at >= '{start_date.isoformat()}'"
-                )
+                total_sms = counts.get('sms_campaigns', 0)
                 
                 st.metric("📱 SMS кампаний", total_sms)
         
@@ -1155,42 +1182,74 @@ def show_comprehensive_report(
 
 # Вспомогательные функции для аналитики
 
-def get_attendance_trend_data(meeting_model: MeetingModel) -> List[Dict[str, Any]]:
-    """Получение данных о тренде посещаемости"""
-    
-    query = """
-        SELECT 
-            meeting_date as date,
-            title,
-            CASE WHEN total_invited > 0 
-                 THEN (attendance_count * 100.0 / total_invited) 
-                 ELSE 0 END as attendance_rate
-        FROM meetings 
-        WHERE status = 'COMPLETED' 
-        AND meeting_date >= date('now', '-180 days')
-        ORDER BY meeting_date
-    """
-    
-    result = meeting_model.db.execute_query(query)
-    return [dict(row) for row in result] if result else []
+@st.cache_data(ttl=120, max_entries=64, show_spinner=False)
+def _cached_get_all(model_key: str, where_clause: str, params: tuple, order_by: str) -> List[Dict[str, Any]]:
+    """Кэшированная выборка записей отчета по набору фильтров"""
+    model = _REPORT_MODELS[model_key](get_database_manager())
+    return [dict(row) for row in model.get_all(where_clause, params, order_by)]
 
 
-def get_points_trend_data(points_model: PointsModel) -> List[Dict[str, Any]]:
-    """Получение данных о тренде начисления баллов"""
-    
-    query = """
-        SELECT 
-            date_earned as date,
-            SUM(points) as points_awarded,
-            COUNT(*) as activities_count
-        FROM citizen_points 
-        WHERE date_earned >= date('now', '-30 days')
-        GROUP BY date_earned
-        ORDER BY date_earned
-    """
-    
-    result = points_model.db.execute_query(query)
-    return [dict(row) for row in result] if result else []
+@st.cache_data(ttl=120, max_entries=64, show_spinner=False)
+def _cached_sms_aggregates(where_clause: str, params: tuple) -> Dict[str, List[Dict[str, Any]]]:
+    """Кэшированные агрегаты отчета по SMS: отправлено по дням и кампании по типам"""
+    sms_model = SMSModel(get_database_manager())
+    return {
+        'daily': [dict(row) for row in sms_model.get_daily_sent(where_clause, params)],
+        'types': [dict(row) for row in sms_model.get_type_counts(where_clause, params)]
+    }
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_activity_statistics(days: int, today_iso: str) -> Dict[str, Any]:
+    """Кэшированная статистика баллов за период (ключ включает текущую дату)"""
+    return PointsModel(get_database_manager()).get_activity_statistics(days)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_leaderboard(limit: int, period_days: int, today_iso: str) -> List[Dict[str, Any]]:
+    """Кэшированный рейтинг граждан за период (ключ включает текущую дату)"""
+    leaderboard = PointsModel(get_database_manager()).get_leaderboard(limit=limit, period_days=period_days)
+    return [dict(row) for row in leaderboard]
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_period_counts(start_iso: str) -> Dict[str, int]:
+    """Кэшированные счетчики комплексного отчета за период"""
+    return get_database_manager().get_period_counts(start_iso)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_dashboard_counts() -> Dict[str, int]:
+    """Кэшированные счетчики сводной панели (один запрос к БД)"""
+    return get_database_manager().get_dashboard_counts()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_database_info() -> Dict[str, Any]:
+    """Кэшированная информация о БД для боковой панели"""
+    return get_database_manager().get_database_info()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_attendance_trend_data(_meeting_model: MeetingModel) -> pd.DataFrame:
+    """Получение данных о тренде посещаемости (кэш на 60 секунд)"""
+    return _trend_rows_to_df(_meeting_model.get_attendance_trend(days_back=180))
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_points_trend_data(_points_model: PointsModel) -> pd.DataFrame:
+    """Получение данных о тренде начисления баллов (кэш на 60 секунд)"""
+    return _trend_rows_to_df(_points_model.get_points_trend(days=30))
+
+
+def _trend_rows_to_df(rows: List[Any]) -> pd.DataFrame:
+    """Строки тренда -> DataFrame с разобранной колонкой date (без промежуточных dict)"""
+    if not rows:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame.from_records(rows, columns=list(rows[0].keys()))
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601')
+    return df
 
 
 def get_recent_system_events(
@@ -1206,8 +1265,9 @@ def get_recent_system_events(
     # Последние граждане
     recent_citizens = citizen_model.get_all(
         "created_at >= date('now', '-7 days')",
-        order_by="created_at DESC"
-    )[:5]
+        order_by="created_at DESC",
+        limit=5
+    )
     
     for citizen in recent_citizens:
         events.append({
@@ -1220,8 +1280,9 @@ def get_recent_system_events(
     # Последние заседания
     recent_meetings = meeting_model.get_all(
         "created_at >= date('now', '-7 days')",
-        order_by="created_at DESC"
-    )[:5]
+        order_by="created_at DESC",
+        limit=5
+    )
     
     for meeting in recent_meetings:
         events.append({
@@ -1231,70 +1292,30 @@ def get_recent_system_events(
             'details': f"Дата: {format_date(meeting['meeting_date'])}"
         })
     
-    # Сортируем по дате
-    events.sort(key=lambda x: x['date'], reverse=True)
-    
-    return events[:10]
+    # Десять самых свежих событий без полной сортировки
+    return heapq.nlargest(10, events, key=operator.itemgetter('date'))
 
 
-def calculate_age_distribution(citizens: List[Dict]) -> Dict[str, int]:
-    """Расчет возрастного распределения"""
+def calculate_age_distribution(df_citizens: pd.DataFrame) -> Dict[str, int]:
+    """Расчет возрастного распределения (возраст - разница годов рождения и текущего)"""
     
-    distribution = {
-        "До 18": 0,
-        "18-30": 0,
-        "31-50": 0,
-        "51-70": 0,
-        "70+": 0
-    }
+    birth_dates = pd.to_datetime(df_citizens['birth_date'], format='%Y-%m-%d', errors='coerce')
+    ages = (date.today().year - birth_dates.dt.year).to_numpy(dtype='float64')
     
-    today = date.today()
+    # Некорректные и пустые даты не учитываются
+    ages = ages[~np.isnan(ages)]
+    counts = np.bincount(np.digitize(ages, _AGE_EDGES), minlength=len(_AGE_LABELS))
     
-    for citizen in citizens:
-        if citizen['birth_date']:
-            try:
-                birth_date = datetime.strptime(citizen['birth_date'], '%Y-%m-%d').date()
-                age = today.year - birth_date.year
-                
-                if age < 18:
-                    distribution["До 18"] += 1
-                elif 18 <= age <= 30:
-                    distribution["18-30"] += 1
-                elif 31 <= age <= 50:
-                    distribution["31-50"] += 1
-                elif 51 <= age <= 70:
-                    distribution["51-70"] += 1
-                else:
-                    distribution["70+"] += 1
-            except:
-                pass
-    
-    return distribution
-
-
-def calculate_points_distribution(citizens: List[Dict]) -> Dict[str, int]:
+    return {label: int(count) for label, count in zip(_AGE_LABELS, counts)}
+
+
+def calculate_points_distribution(df_citizens: pd.DataFrame) -> Dict[str, int]:
     """Расчет распределения по баллам"""
     
-    distribution = {
-        "0 баллов": 0,
-        "1-50": 0,
-        "51-100": 0,
-        "100+": 0
-    }
-    
-    for citizen in citizens:
-        points = citizen['total_points'] or 0
-        
-        if points == 0:
-            distribution["0 баллов"] += 1
-        elif 1 <= points <= 50:
-            distribution["1-50"] += 1
-        elif 51 <= points <= 100:
-            distribution["51-100"] += 1
-        else:
-            distribution["100+"] += 1
+    points = df_citizens['total_points'].fillna(0).to_numpy(dtype='int64')
+    counts = np.bincount(np.digitize(points, _POINTS_EDGES), minlength=len(_POINTS_LABELS))
     
-    return distribution
+    return {label: int(count) for label, count in zip(_POINTS_LABELS, counts)}
 
 
 def create_backup(db: DatabaseManager):
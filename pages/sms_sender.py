@@ -2,22 +2,110 @@
 Страница SMS-рассылок и уведомлений
 """
 
+import html
 import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any
 
-from config.database import DatabaseManager
 from config.settings import SMS_TEMPLATES
 from models.sms import SMSModel
 from models.citizen import CitizenModel
 from models.meeting import MeetingModel
 from utils.helpers import (
-    format_datetime, Paginator, show_success_message, show_error_message
+    format_datetime, Paginator, show_success_message, show_error_message,
+    get_database_manager
 )
 from utils.auth import get_current_user_id, has_permission
 from utils.validators import validate_sms_data, StreamlitValidationHelper
 
+# Фильтр журнала отправки: пункт списка -> статус в sms_logs (None - без фильтра)
+_LOG_STATUS_FILTERS = MappingProxyType({
+    "Все": None,
+    "Отправлено": "SENT",
+    "Доставлено": "DELIVERED",
+    "Ошибка": "FAILED"
+})
+
+# Колонки журнала отправки в порядке выборки SMSModel.get_campaign_logs
+_LOG_COLUMNS = MappingProxyType({
+    "full_name": "ФИО",
+    "phone": "Телефон",
+    "status": "Статус",
+    "sent_at": "Время отправки",
+    "error_message": "Ошибка"
+})
+
+# Количество записей журнала отправки на одной странице
+# (журнал выводится статичной st.table, поэтому страница небольшая)
+_LOGS_PAGE_SIZE = 50
+
+# Количество карточек кампаний на одной странице списка
+_CAMPAIGNS_PAGE_SIZE = 10
+
+# Фильтры списка кампаний: пункт в боковой панели -> тип / условие по дате создания
+_CAMPAIGN_TYPE_FILTERS = MappingProxyType({
+    "Обычная": "REGULAR",
+    "Экстренная": "EMERGENCY",
+    "Напоминание": "REMINDER"
+})
+_DATE_FILTER_SQL = MappingProxyType({
+    "За неделю": "created_at >= date('now', '-7 days')",
+    "За месяц": "created_at >= date('now', '-30 days')",
+    "За квартал": "created_at >= date('now', '-90 days')"
+})
+
+# Полные названия типов кампаний для страницы деталей
+_CAMPAIGN_TYPE_FULL_NAMES = MappingProxyType({
+    'REGULAR': '📢 Обычная рассылка',
+    'EMERGENCY': '🚨 Экстренное уведомление',
+    'REMINDER': '⏰ Напоминание'
+})
+
+# Цвета и названия типов кампаний для карточек списка
+_CAMPAIGN_TYPE_COLORS = MappingProxyType({
+    'REGULAR': '#2196F3',    # Синий
+    'EMERGENCY': '#F44336',  # Красный
+    'REMINDER': '#FF9800'    # Оранжевый
+})
+_CAMPAIGN_TYPE_NAMES = MappingProxyType({
+    'REGULAR': '📢 Обычная',
+    'EMERGENCY': '🚨 Экстренная',
+    'REMINDER': '⏰ Напоминание'
+})
+
+# Статичная часть карточки кампании выводится одним st.markdown;
+# виджетами остаются только кнопки действий
+_CAMPAIGN_CARD_TEMPLATE = (
+    '<div style="display: flex; gap: 16px; align-items: flex-start;">'
+    '<div style="flex: 3;">'
+    '<h3 style="margin: 0;">{title}</h3>'
+    '<span style="background-color: {type_color}; color: white; padding: 4px 12px; '
+    'border-radius: 15px; display: inline-block; font-size: 12px; font-weight: bold; '
+    'margin: 5px 0;">{type_name}</span>'
+    '<br><small style="color: gray;">📅 Создано: {created_at}</small>'
+    '</div>'
+    '<div style="flex: 1;">{stats}</div>'
+    '<div style="flex: 1;">{status}</div>'
+    '</div>'
+    '<div style="margin: 8px 0; padding: 8px 12px; border-left: 3px solid rgba(128, 128, 128, 0.4);">'
+    '💬 {message_preview}<br><small style="color: gray;">Длина: {message_length} символов</small>'
+    '</div>'
+)
+
+# Ключи шаблонов SMS и их отображаемые названия (вычисляются один раз при импорте)
+_TEMPLATE_KEYS = tuple(SMS_TEMPLATES)
+_TEMPLATE_DISPLAY = MappingProxyType({key: key.replace('_', ' ').title() for key in SMS_TEMPLATES})
+
+
+@st.cache_resource
+def _get_models():
+    """Модели страницы SMS поверх общего менеджера БД (создаются один раз)"""
+    db = get_database_manager()
+    return SMSModel(db), CitizenModel(db), MeetingModel(db)
+
+
 def show_sms_page():
     """Главная функция страницы SMS-рассылок"""
     
@@ -29,11 +117,8 @@ def show_sms_page():
         st.error("❌ У вас нет прав доступа к этому разделу")
         return
     
-    # Инициализируем модели
-    db = DatabaseManager()
-    sms_model = SMSModel(db)
-    citizen_model = CitizenModel(db)
-    meeting_model = MeetingModel(db)
+    # Модели поверх общего менеджера БД (создаются один раз)
+    sms_model, citizen_model, meeting_model = _get_models()
     
     # Боковая панель с действиями
     with st.sidebar:
@@ -76,7 +161,7 @@ def show_sms_page():
         st.markdown("### 📈 Сводка")
         
         # Получаем быструю статистику
-        quick_stats = get_quick_sms_stats(sms_model)
+        quick_stats = _cached_quick_sms_stats(sms_model)
         
         st.metric("📤 Всего кампаний", quick_stats.get('total_campaigns', 0))
         st.metric("📱 SMS за месяц", quick_stats.get('monthly_sms', 0))
@@ -124,24 +209,15 @@ def show_sms_campaigns_list(
     where_conditions = []
     params = []
     
-    # Текстовый поиск
+    # Текстовый поиск: одно сравнение LIKE по названию и тексту сразу
+    # (разделитель исключает совпадения на стыке полей)
     if search_term:
-        search_conditions = [
-            "UPPER(title) LIKE UPPER(?)",
-            "UPPER(message_text) LIKE UPPER(?)"
-        ]
-        where_conditions.append(f"({' OR '.join(search_conditions)})")
-        search_param = f"%{search_term}%"
-        params.extend([search_param] * 2)
+        where_conditions.append("(UPPER(title) || ' §§ ' || UPPER(message_text)) LIKE UPPER(?)")
+        params.append(f"%{search_term}%")
     
     # Фильтр по типу кампании
     if campaign_type != "Все":
-        type_map = {
-            "Обычная": "REGULAR",
-            "Экстренная": "EMERGENCY",
-            "Напоминание": "REMINDER"
-        }
-        sms_type = type_map.get(campaign_type)
+        sms_type = _CAMPAIGN_TYPE_FILTERS.get(campaign_type)
         if sms_type:
             where_conditions.append("campaign_type = ?")
             params.append(sms_type)
@@ -151,110 +227,96 @@ def show_sms_campaigns_list(
     if date_condition:
         where_conditions.append(date_condition)
     
-    # Выполняем запрос
+    # Выполняем запрос и выводим страницу списка
     where_clause = " AND ".join(where_conditions) if where_conditions else ""
-    campaigns = sms_model.get_all(where_clause, tuple(params), "created_at DESC")
     
-    if not campaigns:
+    _campaign_list_fragment(sms_model, where_clause, tuple(params))
+
+
+@st.fragment
+def _campaign_list_fragment(sms_model: SMSModel, where_clause: str, params: tuple):
+    """Страница списка кампаний (кнопки карточек перезапускают только этот блок)"""
+    
+    page_key = "sms_pagination_current_page"
+    
+    # Пагинация на стороне БД: выбирается только текущая страница
+    result = sms_model.get_campaigns_page(
+        st.session_state.get(page_key, 1), _CAMPAIGNS_PAGE_SIZE, where_clause, params
+    )
+    pagination = result['pagination']
+    
+    if not pagination['total_count']:
         st.info("📱 SMS кампании не найдены по заданным критериям")
         return
     
+    # После смены фильтров сохраненная страница может оказаться за пределами списка
+    if pagination['page'] > pagination['total_pages']:
+        st.session_state[page_key] = pagination['total_pages']
+        result = sms_model.get_campaigns_page(
+            pagination['total_pages'], _CAMPAIGNS_PAGE_SIZE, where_clause, params
+        )
+    
     # Показываем количество найденных записей
-    st.success(f"✅ Найдено кампаний: {len(campaigns)}")
+    st.success(f"✅ Найдено кампаний: {pagination['total_count']}")
     
-    # Пагинация
-    paginator = Paginator(campaigns, items_per_page=10)
-    current_page = paginator.show_pagination_controls("sms_pagination")
-    page_campaigns = paginator.get_page(current_page)
+    paginator = Paginator(result['data'], items_per_page=_CAMPAIGNS_PAGE_SIZE, total_items=pagination['total_count'])
+    paginator.show_pagination_controls("sms_pagination")
+    page_campaigns = result['data']
     
     # Отображаем список кампаний
     for campaign in page_campaigns:
         show_campaign_card(campaign, sms_model)
 
 
-def show_campaign_card(campaign: Dict[str, Any], sms_model: SMSModel):
-    """Отображение карточки SMS кампании"""
+def _campaign_card_html(campaign: Dict[str, Any]) -> str:
+    """HTML заголовка карточки кампании по шаблону _CAMPAIGN_CARD_TEMPLATE"""
     
-    # Определяем цвета для типов кампаний
-    type_colors = {
-        'REGULAR': '#2196F3',    # Синий
-        'EMERGENCY': '#F44336',  # Красный
-        'REMINDER': '#FF9800'    # Оранжевый
-    }
+    campaign_type = campaign['campaign_type']
     
-    type_names = {
-        'REGULAR': '📢 Обычная',
-        'EMERGENCY': '🚨 Экстренная',
-        'REMINDER': '⏰ Напоминание'
-    }
+    # Статистика отправки
+    sent_count = campaign['sent_count'] or 0
+    delivered_count = campaign['delivered_count'] or 0
+    failed_count = campaign['failed_count'] or 0
     
-    campaign_type = campaign['campaign_type']
-    type_color = type_colors.get(campaign_type, '#999999')
-    type_name = type_names.get(campaign_type, campaign_type)
+    stats = f"📤 Отправлено: <b>{sent_count}</b>"
+    if sent_count > 0:
+        stats += f"<br>✅ Доставлено: <b>{delivered_count}</b> ({campaign['success_rate']:.1f}%)"
+        
+        if failed_count > 0:
+            stats += f"<br>❌ Ошибки: <b>{failed_count}</b>"
+    
+    # Статус отправки
+    if campaign['sent_at']:
+        status = f"✅ Отправлено<br><small>Время: {format_datetime(campaign['sent_at'])}</small>"
+    elif campaign['scheduled_at']:
+        status = f"⏱️ Запланировано<br><small>На: {format_datetime(campaign['scheduled_at'])}</small>"
+    else:
+        status = "📝 Черновик"
+    
+    # Текст сообщения (превью)
+    message_text = campaign['message_text']
+    message_preview = message_text[:100]
+    if len(message_text) > 100:
+        message_preview += "..."
+    
+    return _CAMPAIGN_CARD_TEMPLATE.format(
+        title=html.escape(str(campaign['title'])),
+        type_color=_CAMPAIGN_TYPE_COLORS.get(campaign_type, '#999999'),
+        type_name=html.escape(str(_CAMPAIGN_TYPE_NAMES.get(campaign_type, campaign_type))),
+        created_at=format_datetime(campaign['created_at']),
+        stats=stats,
+        status=status,
+        message_preview=html.escape(message_preview),
+        message_length=len(message_text)
+    )
+
+
+def show_campaign_card(campaign: Dict[str, Any], sms_model: SMSModel):
+    """Отображение карточки SMS кампании"""
     
     with st.container():
-        # Заголовок кампании
-        col1, col2, col3 = st.columns([3, 1, 1])
-        
-        with col1:
-            st.markdown(f"### {campaign['title']}")
-            
-            # Тип кампании
-            st.markdown(f"""
-            <div style="
-                background-color: {type_color};
-                color: white;
-                padding: 4px 12px;
-                border-radius: 15px;
-                display: inline-block;
-                font-size: 12px;
-                font-weight: bold;
-                margin: 5px 0;
-            ">
-                {type_name}
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Дата создания
-            created_at = format_datetime(campaign['created_at'])
-            st.caption(f"📅 Создано: {created_at}")
-        
-        with col2:
-            # Статистика отправки
-            sent_count = campaign['sent_count'] or 0
-            delivered_count = campaign['delivered_count'] or 0
-            failed_count = campaign['failed_count'] or 0
-            
-            st.metric("📤 Отправлено", sent_count)
-            
-            if sent_count > 0:
-                success_rate = (delivered_count / sent_count) * 100
-                st.metric("✅ Доставлено", delivered_count, delta=f"{success_rate:.1f}%")
-                
-                if failed_count > 0:
-                    st.metric("❌ Ошибки", failed_count)
-        
-        with col3:
-            # Статус отправки
-            if campaign['sent_at']:
-                st.success("✅ Отправлено")
-                sent_at = format_datetime(campaign['sent_at'])
-                st.caption(f"Время: {sent_at}")
-            elif campaign['scheduled_at']:
-                st.info("⏱️ Запланировано")
-                scheduled_at = format_datetime(campaign['scheduled_at'])
-                st.caption(f"На: {scheduled_at}")
-            else:
-                st.warning("📝 Черновик")
-        
-        # Текст сообщения
-        message_preview = campaign['message_text'][:100]
-        if len(campaign['message_text']) > 100:
-            message_preview += "..."
-        
-        with st.expander("💬 Текст сообщения"):
-            st.write(campaign['message_text'])
-            st.caption(f"Длина: {len(campaign['message_text'])} символов")
+        # Заголовок, статистика, статус и текст выводятся одним блоком HTML
+        st.markdown(_campaign_card_html(campaign), unsafe_allow_html=True)
         
         # Кнопки действий
         col1, col2, col3, col4 = st.columns(4)
@@ -280,6 +342,7 @@ def show_campaign_card(campaign: Dict[str, Any], sms_model: SMSModel):
                 if st.session_state.get(f"confirm_delete_sms_{campaign['id']}"):
                     success = sms_model.delete(campaign['id'])
                     if success:
+                        _clear_sms_cache()
                         show_success_message("SMS кампания удалена")
                         st.rerun()
                     else:
@@ -316,18 +379,13 @@ def show_create_sms_form(sms_model: SMSModel, citizen_model: CitizenModel, meeti
     with col2:
         if sms_type == "Уведомление о заседании":
             # Получаем предстоящие заседания
-            upcoming_meetings = meeting_model.get_upcoming_meetings(30)
+            meeting_options = _cached_upcoming_meeting_options(meeting_model)
             
-            if upcoming_meetings:
-                meeting_options = {}
-                for meeting in upcoming_meetings:
-                    meeting_date = format_datetime(meeting['meeting_date'])
-                    meeting_options[meeting['id']] = f"{meeting['title']} ({meeting_date})"
-                
+            if meeting_options:
                 selected_meeting_id = st.selectbox(
                     "Выберите заседание",
                     options=list(meeting_options.keys()),
-                    format_func=lambda x: meeting_options[x],
+                    format_func=meeting_options.__getitem__,
                     help="Заседание для уведомления"
                 )
             else:
@@ -336,8 +394,8 @@ def show_create_sms_form(sms_model: SMSModel, citizen_model: CitizenModel, meeti
         elif sms_type == "Использовать шаблон":
             template_name = st.selectbox(
                 "Выберите шаблон",
-                options=list(SMS_TEMPLATES.keys()),
-                format_func=lambda x: x.replace('_', ' ').title(),
+                options=_TEMPLATE_KEYS,
+                format_func=_TEMPLATE_DISPLAY.__getitem__,
                 help="Готовые шаблоны сообщений"
             )
     
@@ -399,7 +457,7 @@ def show_create_sms_form(sms_model: SMSModel, citizen_model: CitizenModel, meeti
                 st.info("Функция выборочной отправки будет доступна после создания кампании")
             
             # Предварительный подсчет получателей
-            recipient_count = get_recipients_count(citizen_model, recipient_type)
+            recipient_count = _cached_recipients_count(citizen_model, recipient_type)
             st.metric("📱 Получателей", recipient_count)
             
             # Планирование отправки
@@ -457,6 +515,8 @@ def show_create_sms_form(sms_model: SMSModel, citizen_model: CitizenModel, meeti
                 )
                 
                 if campaign_id:
+                    _clear_sms_cache()
+                    
                     if send_now:
                         # Отправляем сразу
                         recipients = get_recipients_list(citizen_model, recipient_type)
@@ -534,60 +594,64 @@ def show_campaign_details(sms_model: SMSModel, campaign_id: int):
     st.markdown("---")
     st.markdown("#### 📋 Журнал отправки")
     
-    # Получаем логи отправки
-    logs_query = """
-        SELECT sl.*, c.full_name
-        FROM sms_logs sl
-        LEFT JOIN citizens c ON sl.citizen_id = c.id
-        WHERE sl.campaign_id = ?
-        ORDER BY sl.created_at DESC
-    """
+    # Фильтры для логов
+    col1, col2 = st.columns(2)
     
-    logs = sms_model.db.execute_query(logs_query, (campaign_id,))
+    with col1:
+        status_filter = st.selectbox(
+            "Фильтр по статусу",
+            ["Все", "Отправлено", "Доставлено", "Ошибка"]
+        )
     
-    if logs:
-        # Фильтры для логов
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            status_filter = st.selectbox(
-                "Фильтр по статусу",
-                ["Все", "Отправлено", "Доставлено", "Ошибка"]
-            )
-        
-        with col2:
-            search_phone = st.text_input("Поиск по телефону")
-        
-        # Фильтруем логи
-        filtered_logs = filter_sms_logs(logs, status_filter, search_phone)
-        
-        if filtered_logs:
-            # Отображаем логи в таблице
-            df_logs = pd.DataFrame([dict(log) for log in filtered_logs])
-            
-            # Переименовываем колонки
-            column_config = {
-                "full_name": "ФИО",
-                "phone": "Телефон",
-                "status": "Статус",
-                "sent_at": "Время отправки",
-                "error_message": "Ошибка"
-            }
-            
-            st.dataframe(
-                df_logs[list(column_config.keys())].rename(columns=column_config),
-                use_container_width=True,
-                hide_index=True
-            )
+    with col2:
+        search_phone = st.text_input("Поиск по телефону")
+    
+    # Фильтрация и постраничная выборка выполняются в SQL
+    logs_page = sms_model.get_campaign_logs(
+        campaign_id,
+        status=_LOG_STATUS_FILTERS.get(status_filter),
+        phone_search=search_phone,
+        page=st.session_state.get(f"sms_logs_page_{campaign_id}", 1),
+        page_size=_LOGS_PAGE_SIZE
+    )
+    
+    filtered_logs = logs_page['data']
+    pagination = logs_page['pagination']
+    
+    if not filtered_logs:
+        if status_filter == "Все" and not search_phone:
+            st.info("Журнал отправки пуст")
         else:
             st.info("Нет записей для отображения")
-    else:
-        st.info("Журнал отправки пуст")
+        return
+    
+    if pagination['total_pages'] > 1:
+        st.session_state[f"sms_logs_page_{campaign_id}"] = pagination['page']
+        st.number_input(
+            f"Страница журнала (из {pagination['total_pages']})",
+            min_value=1,
+            max_value=pagination['total_pages'],
+            key=f"sms_logs_page_{campaign_id}"
+        )
+    
+    # Отображаем логи статичной таблицей (строки уже в порядке колонок _LOG_COLUMNS);
+    # индекс - сквозной номер записи с учетом страницы
+    first_row = (pagination['page'] - 1) * pagination['page_size'] + 1
+    df_logs = pd.DataFrame.from_records(
+        filtered_logs,
+        columns=list(_LOG_COLUMNS.values()),
+        index=pd.RangeIndex(first_row, first_row + len(filtered_logs), name="№")
+    )
+    
+    st.table(df_logs)
 
 
 def show_sms_statistics(sms_model: SMSModel):
     """Статистика SMS рассылок"""
     
+    # plotly загружается только при открытии статистики
+    import plotly.express as px
+    
     st.markdown("### 📊 Статистика SMS-рассылок")
     
     col1, col2 = st.columns([1, 4])
@@ -598,7 +662,7 @@ def show_sms_statistics(sms_model: SMSModel):
             st.rerun()
     
     # Общая статистика
-    stats = get_comprehensive_sms_stats(sms_model)
+    stats = _cached_comprehensive_sms_stats(sms_model)
     
     # Основные метрики
     col1, col2, col3, col4 = st.columns(4)
@@ -633,8 +697,6 @@ def show_sms_statistics(sms_model: SMSModel):
                 'REMINDER': 'Напоминания'
             }
             
-            import plotly.express as px
-            
             labels = [type_names.get(k, k) for k in type_stats.keys()]
             values = list(type_stats.values())
             
@@ -649,13 +711,12 @@ def show_sms_statistics(sms_model: SMSModel):
     
     with col2:
         # Динамика отправки SMS
-        monthly_data = get_monthly_sms_data(sms_model)
+        monthly_data = _cached_monthly_sms_data(sms_model)
         if monthly_data:
             st.markdown("#### 📈 Динамика отправки")
             
             df = pd.DataFrame(monthly_data)
             
-            import plotly.express as px
             fig = px.bar(
                 df, x='month', y='count',
                 title="SMS по месяцам",
@@ -682,7 +743,7 @@ def show_sms_templates():
     
     # Отображаем все доступные шаблоны
     for template_key, template_text in SMS_TEMPLATES.items():
-        template_name = template_key.replace('_', ' ').title()
+        template_name = _TEMPLATE_DISPLAY[template_key]
         
         with st.expander(f"📄 {template_name}"):
             st.code(template_text, language="text")
@@ -705,35 +766,17 @@ def show_sms_templates():
 def get_quick_sms_stats(sms_model: SMSModel) -> Dict[str, Any]:
     """Получение быстрой статистики SMS"""
     
-    # Общее количество кампаний
-    total_campaigns = sms_model.count()
-    
-    # Кампании за месяц
-    monthly_campaigns = sms_model.count("created_at >= date('now', '-30 days')")
-    
-    # Статистика доставки
-    delivery_query = """
-        SELECT 
-            COUNT(*) as total_sms,
-            SUM(CASE WHEN status = 'DELIVERED' THEN 1 ELSE 0 END) as delivered
-        FROM sms_logs
-    """
+    # Счетчики кампаний и SMS за последние 30 дней
+    counts = sms_model.get_monthly_totals()
     
-    result = sms_model.db.execute_query(delivery_query)
-    
-    if result:
-        total_sms = result[0]['total_sms']
-        delivered = result[0]['delivered']
-        delivery_rate = (delivered / total_sms * 100) if total_sms > 0 else 0
-    else:
-        total_sms = 0
-        delivered = 0
-        delivery_rate = 0
+    monthly_sms = counts.get('monthly_sms', 0)
+    delivered = counts.get('monthly_delivered', 0)
+    delivery_rate = (delivered / monthly_sms * 100) if monthly_sms > 0 else 0
     
     return {
-        'total_campaigns': total_campaigns,
-        'monthly_campaigns': monthly_campaigns,
-        'monthly_sms': total_sms,  # Упрощено для демо
+        'total_campaigns': counts.get('total_campaigns', 0),
+        'monthly_campaigns': counts.get('monthly_campaigns', 0),
+        'monthly_sms': monthly_sms,
         'delivered_rate': delivered,
         'delivered_percentage': delivery_rate
     }
@@ -742,72 +785,87 @@ def get_quick_sms_stats(sms_model: SMSModel) -> Dict[str, Any]:
 def get_comprehensive_sms_stats(sms_model: SMSModel) -> Dict[str, Any]:
     """Получение подробной статистики SMS"""
     
-    stats = {}
+    # Счетчики кампаний и SMS одним запросом
+    counts = sms_model.get_summary_counts()
     
-    # Общее количество кампаний
-    stats['total_campaigns'] = sms_model.count()
+    total_sms = counts.get('total_sms', 0)
+    delivered = counts.get('delivered', 0)
     
-    # Кампании за месяц
-    stats['monthly_campaigns'] = sms_model.count("created_at >= date('now', '-30 days')")
+    stats = {
+        'total_campaigns': counts.get('total_campaigns', 0),
+        'monthly_campaigns': counts.get('monthly_campaigns', 0),
+        'total_sms': total_sms,
+        'delivery_rate': (delivered / total_sms * 100) if total_sms > 0 else 0
+    }
     
     # Статистика по типам
-    type_query = """
-        SELECT campaign_type, COUNT(*) as count
-        FROM sms_campaigns
-        GROUP BY campaign_type
-    """
-    
-    type_result = sms_model.db.execute_query(type_query)
-    if type_result:
-        stats['by_type'] = {row['campaign_type']: row['count'] for row in type_result}
-    else:
-        stats['by_type'] = {}
+    stats['by_type'] = {
+        row['campaign_type']: row['campaigns_count'] for row in sms_model.get_type_counts()
+    }
     
-    # Общая статистика SMS
-    sms_stats_query = """
-        SELECT 
-            COUNT(*) as total_sms,
-            SUM(CASE WHEN status = 'DELIVERED' THEN 1 ELSE 0 END) as delivered,
-            SUM(CASE WHEN status = 'FAILED' THEN 1 ELSE 0 END) as failed
-        FROM sms_logs
-    """
+    return stats
+
+
+@st.cache_data(ttl=60, max_entries=4, show_spinner=False)
+def _cached_quick_sms_stats(_sms_model: SMSModel) -> Dict[str, Any]:
+    """Кэшированная быстрая статистика SMS для боковой панели"""
+    return get_quick_sms_stats(_sms_model)
+
+
+@st.cache_data(ttl="5m", max_entries=4, show_spinner=False)
+def _cached_comprehensive_sms_stats(_sms_model: SMSModel) -> Dict[str, Any]:
+    """Кэшированная подробная статистика SMS"""
+    return get_comprehensive_sms_stats(_sms_model)
+
+
+@st.cache_data(ttl="1h", max_entries=4, show_spinner=False)
+def _cached_monthly_sms_data(_sms_model: SMSModel) -> List[Dict[str, Any]]:
+    """Кэшированные данные по SMS за последние месяцы"""
+    return get_monthly_sms_data(_sms_model)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _cached_recipients_count(_citizen_model: CitizenModel, recipient_type: str) -> int:
+    """Кэшированное количество получателей (форма перезапускается на каждый ввод)"""
+    return get_recipients_count(_citizen_model, recipient_type)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_upcoming_meeting_options(_meeting_model: MeetingModel) -> Dict[int, str]:
+    """Кэшированные подписи предстоящих заседаний (id -> "название (дата)") для формы"""
     
-    sms_result = sms_model.db.execute_query(sms_stats_query)
-    if sms_result:
-        total_sms = sms_result[0]['total_sms']
-        delivered = sms_result[0]['delivered']
-        
-        stats['total_sms'] = total_sms
-        stats['delivery_rate'] = (delivered / total_sms * 100) if total_sms > 0 else 0
-    else:
-        stats['total_sms'] = 0
-        stats['delivery_rate'] = 0
+    options = {}
+    for meeting in _meeting_model.get_upcoming_meetings(30):
+        meeting_date = format_datetime(meeting['meeting_date'])
+        options[meeting['id']] = f"{meeting['title']} ({meeting_date})"
     
-    return stats
+    return options
+
+
+def _clear_sms_cache():
+    """Сброс кэшированной статистики после изменения кампаний"""
+    _cached_quick_sms_stats.clear()
+    _cached_comprehensive_sms_stats.clear()
+    _cached_monthly_sms_data.clear()
 
 
 def get_sms_date_filter_condition(date_filter: str) -> str:
     """Получение условия для фильтрации по дате"""
-    
-    conditions = {
-        "За неделю": "created_at >= date('now', '-7 days')",
-        "За месяц": "created_at >= date('now', '-30 days')",
-        "За квартал": "created_at >= date('now', '-90 days')"
-    }
-    
-    return conditions.get(date_filter, "")
+    return _DATE_FILTER_SQL.get(date_filter, "")
 
 
 def get_monthly_sms_data(sms_model: SMSModel) -> List[Dict[str, Any]]:
     """Получение данных по SMS за последние месяцы"""
     
+    # created_month - индексированная генерируемая колонка strftime('%Y-%m', created_at):
+    # выборка и группировка идут по индексу без вычисления strftime для каждой строки
     query = """
         SELECT 
-            strftime('%Y-%m', created_at) as month,
+            created_month as month,
             COUNT(*) as count
         FROM sms_logs 
-        WHERE created_at >= date('now', '-12 months')
-        GROUP BY strftime('%Y-%m', created_at)
+        WHERE created_month >= strftime('%Y-%m', 'now', '-12 months')
+        GROUP BY created_month
         ORDER BY month
     """
     
@@ -850,21 +908,9 @@ def get_recipients_count(citizen_model: CitizenModel, recipient_type: str) -> in
 def get_recipients_list(citizen_model: CitizenModel, recipient_type: str) -> List[Dict[str, Any]]:
     """Получение списка получателей"""
     
-    if recipient_type == "Только с телефонами":
-        citizens = citizen_model.get_citizens_with_phones()
-    else:
-        citizens = citizen_model.get_active_citizens()
-    
-    recipients = []
-    for citizen in citizens:
-        if citizen['phone']:
-            recipients.append({
-                'citizen_id': citizen['id'],
-                'phone': citizen['phone'],
-                'full_name': citizen['full_name']
-            })
-    
-    return recipients
+    # Выборка сразу в нужной форме; граждане без телефона исключаются в SQL
+    # для любого типа получателей
+    return citizen_model.get_sms_recipients()
 
 
 def create_meeting_notification_text(meeting: Dict[str, Any]) -> str:
@@ -911,10 +957,7 @@ def send_campaign_now(sms_model: SMSModel, campaign_id: int):
     """Отправка кампании прямо сейчас"""
     
     # Получаем список получателей (упрощенная версия)
-    from models.citizen import CitizenModel
-    
-    db = DatabaseManager()
-    citizen_model = CitizenModel(db)
+    _, citizen_model, _ = _get_models()
     
     recipients = get_recipients_list(citizen_model, "Только с телефонами")
     
@@ -924,6 +967,7 @@ def send_campaign_now(sms_model: SMSModel, campaign_id: int):
     
     # Отправляем
     result = sms_model.send_campaign(campaign_id, recipients)
+    _clear_sms_cache()
     
     if result['success']:
         show_success_message(
@@ -955,36 +999,6 @@ def show_campaign_stats_modal(sms_model: SMSModel, campaign_id: int):
                 st.metric("📈 Успешность", f"{success_rate:.1f}%")
 
 
-def filter_sms_logs(logs: List[Dict], status_filter: str, search_phone: str) -> List[Dict]:
-    """Фильтрация логов SMS"""
-    
-    filtered = logs
-    
-    # Фильтр по статусу
-    if status_filter != "Все":
-        status_map = {
-            "Отправлено": "SENT",
-            "Доставлено": "DELIVERED", 
-            "Ошибка": "FAILED"
-        }
-        target_status = status_map.get(status_filter)
-        if target_status:
-            filtered = [log for log in filtered if log['status'] == target_status]
-    
-    # Поиск по телефону
-    if search_phone:
-        filtered = [log for log in filtered if search_phone in (log['phone'] or '')]
-    
-    return filtered
-
-
 def get_campaign_type_name(campaign_type: str) -> str:
     """Получение читаемого названия типа кампании"""
-    
-    type_names = {
-        'REGULAR': '📢 Обычная рассылка',
-        'EMERGENCY': '🚨 Экстренное уведомление',
-        'REMINDER': '⏰ Напоминание'
-    }
-    
-    return type_names.get(campaign_type, campaign_type)
\ No newline at end of file
+    return _CAMPAIGN_TYPE_FULL_NAMES.get(campaign_type, campaign_type)
\ No newline at end of file
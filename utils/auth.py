@@ -4,13 +4,39 @@
 
 import streamlit as st
 import hashlib
+import hmac
+import secrets
 import sqlite3
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, FrozenSet
+from datetime import datetime
+from functools import lru_cache
 import logging
+import time
+
+from config.settings import AppSettings, USER_ROLES, get_settings
 
 logger = logging.getLogger(__name__)
 
+# Параметры scrypt для хешей паролей (~16 МБ памяти и десятки мс на проверку)
+_SCRYPT_N = 2 ** 14
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+_SCRYPT_SALT_BYTES = 16
+
+# Префикс хешей scrypt; хеши без префикса - устаревший несоленый SHA-256
+_SCRYPT_PREFIX = "scrypt$"
+
+# Таймаут сессии и порог предупреждения о его истечении, в секундах
+_SESSION_TIMEOUT_SECONDS = AppSettings.SESSION_TIMEOUT_MINUTES * 60
+_SESSION_WARNING_SECONDS = 5 * 60
+
+
+@lru_cache(maxsize=16)
+def _permissions_for(role: str) -> FrozenSet[str]:
+    """Множество разрешений роли (роли фиксированы, вычисляется один раз на роль)"""
+    return frozenset(USER_ROLES.get(role, {}).get('permissions', []))
+
+
 class AuthManager:
     """Менеджер авторизации"""
     
@@ -26,9 +52,15 @@ class AuthManager:
             password: Пароль для хеширования
             
         Returns:
-            Хешированный пароль
+            Хешированный пароль в формате scrypt$n$r$p$соль$хеш
         """
-        return hashlib.sha256(password.encode()).hexdigest()
+        salt = secrets.token_bytes(_SCRYPT_SALT_BYTES)
+        digest = hashlib.scrypt(password.encode(), salt=salt, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P)
+        return f"{_SCRYPT_PREFIX}{_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}${salt.hex()}${digest.hex()}"
+    
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Хеш создан устаревшим алгоритмом и должен быть пересчитан"""
+        return not hashed_password.startswith(_SCRYPT_PREFIX)
     
     def verify_password(self, password: str, hashed_password: str) -> bool:
         """
@@ -41,7 +73,20 @@ class AuthManager:
         Returns:
             True если пароль верный
         """
-        return self.hash_password(password) == hashed_password
+        if self.needs_rehash(hashed_password):
+            # Устаревший формат: SHA-256 без соли
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), hashed_password)
+        
+        try:
+            n, r, p, salt_hex, digest_hex = hashed_password[len(_SCRYPT_PREFIX):].split('$')
+            digest = hashlib.scrypt(
+                password.encode(), salt=bytes.fromhex(salt_hex), n=int(n), r=int(r), p=int(p)
+            )
+        except ValueError:
+            logger.error("Некорректный формат хеша пароля")
+            return False
+        
+        return hmac.compare_digest(digest.hex(), digest_hex)
     
     def authenticate_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """
@@ -69,8 +114,14 @@ class AuthManager:
         user = result[0]
         
         if self.verify_password(password, user['password_hash']):
-            # Обновляем время последнего входа
-            self.update_last_login(user['id'])
+            # Обновляем время последнего входа; устаревший хеш переводим на scrypt
+            # тем же запросом
+            new_hash = None
+            if self.needs_rehash(user['password_hash']):
+                new_hash = self.hash_password(password)
+                logger.info(f"Хеш пароля пользователя {username} переведен на scrypt")
+            
+            self.update_last_login(user['id'], new_hash)
             
             user_data = {
                 'id': user['id'],
@@ -86,10 +137,22 @@ class AuthManager:
             logger.warning(f"Неверный пароль для пользователя: {username}")
             return None
     
-    def update_last_login(self, user_id: int):
-        """Обновление времени последнего входа"""
-        query = "UPDATE users SET last_login = ? WHERE id = ?"
-        self.db.execute_query(query, (datetime.now().isoformat(), user_id), fetch=False)
+    def update_last_login(self, user_id: int, password_hash: Optional[str] = None):
+        """
+        Обновление времени последнего входа
+        
+        Args:
+            user_id: ID пользователя
+            password_hash: Новый хеш пароля, записываемый тем же UPDATE (при миграции хеша)
+        """
+        if password_hash:
+            query = "UPDATE users SET last_login = ?, password_hash = ? WHERE id = ?"
+            params = (datetime.now().isoformat(), password_hash, user_id)
+        else:
+            query = "UPDATE users SET last_login = ? WHERE id = ?"
+            params = (datetime.now().isoformat(), user_id)
+        
+        self.db.execute_query(query, params, fetch=False)
     
     def create_user(
         self,
@@ -171,10 +234,7 @@ class AuthManager:
         Returns:
             Список разрешений
         """
-        from config.settings import USER_ROLES
-        
-        role_config = USER_ROLES.get(role, {})
-        return role_config.get('permissions', [])
+        return list(USER_ROLES.get(role, {}).get('permissions', []))
     
     def check_permission(self, user_role: str, required_permission: str) -> bool:
         """
@@ -187,7 +247,7 @@ class AuthManager:
         Returns:
             True если доступ разрешен
         """
-        permissions = self.get_user_permissions(user_role)
+        permissions = _permissions_for(user_role)
         
         # Администратор имеет все права
         if 'all' in permissions:
@@ -196,6 +256,21 @@ class AuthManager:
         return required_permission in permissions
 
 
+@st.cache_resource
+def get_auth_manager() -> AuthManager:
+    """
+    Общий экземпляр менеджера авторизации
+    
+    Создается один раз на процесс поверх общего менеджера БД.
+    
+    Returns:
+        AuthManager: Экземпляр менеджера авторизации
+    """
+    from utils.helpers import get_database_manager
+    
+    return AuthManager(get_database_manager())
+
+
 def init_session_state():
     """Инициализация состояния сессии"""
     if 'authenticated' not in st.session_state:
@@ -206,6 +281,24 @@ def init_session_state():
     
     if 'login_time' not in st.session_state:
         st.session_state.login_time = None
+    
+    if 'login_mono' not in st.session_state:
+        st.session_state.login_mono = None
+
+
+def _start_session_clock():
+    """Отметка времени входа: login_time для отображения, login_mono для таймаута"""
+    st.session_state.login_time = datetime.now()
+    st.session_state.login_mono = time.monotonic()
+
+
+def _session_elapsed() -> Optional[float]:
+    """Секунды с начала сессии по монотонным часам или None, если сессии нет"""
+    login_mono = st.session_state.get('login_mono')
+    if not st.session_state.get('authenticated') or login_mono is None:
+        return None
+    
+    return time.monotonic() - login_mono
 
 
 def check_session_timeout() -> bool:
@@ -215,20 +308,17 @@ def check_session_timeout() -> bool:
     Returns:
         True если сессия активна
     """
-    if not st.session_state.authenticated or not st.session_state.login_time:
+    elapsed = _session_elapsed()
+    if elapsed is None:
         return False
     
     # Проверяем таймаут
-    session_duration = datetime.now() - st.session_state.login_time
-    max_duration = timedelta(minutes=30)  # 30 минут
-    
-    if session_duration > max_duration:
+    if elapsed > _SESSION_TIMEOUT_SECONDS:
         # Сессия истекла
         logout()
         return False
     
     return True
-from config.settings import get_settings
 
 
 def check_authentication():
@@ -246,7 +336,7 @@ def check_authentication():
                         "role": "admin",
                         "full_name": "Администратор"
                     }
-                    st.session_state["login_time"] = datetime.now()
+                    _start_session_clock()
                     st.rerun()
                 else:
                     st.error("Неверный логин или пароль")
@@ -391,12 +481,8 @@ def login(username: str, password: str) -> bool:
     Returns:
         True если вход успешен
     """
-    from config.database import DatabaseManager
-    
     try:
-        # Получаем экземпляр базы данных
-        db = DatabaseManager()
-        auth_manager = AuthManager(db)
+        auth_manager = get_auth_manager()
         
         # Аутентификация
         user_data = auth_manager.authenticate_user(username, password)
@@ -405,7 +491,7 @@ def login(username: str, password: str) -> bool:
             # Сохраняем данные в сессии
             st.session_state.authenticated = True
             st.session_state.user = user_data
-            st.session_state.login_time = datetime.now()
+            _start_session_clock()
             
             logger.info(f"Пользователь {username} вошел в систему")
             return True
@@ -428,10 +514,11 @@ def logout():
     st.session_state.authenticated = False
     st.session_state.user = None
     st.session_state.login_time = None
+    st.session_state.login_mono = None
     
     # Очищаем другие данные сессии если есть
     keys_to_clear = [key for key in st.session_state.keys() 
-                     if key not in ['authenticated', 'user', 'login_time']]
+                     if key not in ['authenticated', 'user', 'login_time', 'login_mono']]
     
     for key in keys_to_clear:
         del st.session_state[key]
@@ -484,11 +571,7 @@ def has_permission(permission: str) -> bool:
     if not user_role:
         return False
     
-    from config.database import DatabaseManager
-    db = DatabaseManager()
-    auth_manager = AuthManager(db)
-    
-    return auth_manager.check_permission(user_role, permission)
+    return get_auth_manager().check_permission(user_role, permission)
 
 
 def require_permission(permission: str):
@@ -514,9 +597,9 @@ def show_user_info():
         st.sidebar.write(f"Роль: {user['role']}")
         
         # Время входа
-        if st.session_state.login_time:
-            login_duration = datetime.now() - st.session_state.login_time
-            hours, remainder = divmod(login_duration.seconds, 3600)
+        elapsed = _session_elapsed()
+        if elapsed is not None:
+            hours, remainder = divmod(int(elapsed), 3600)
             minutes, _ = divmod(remainder, 60)
             st.sidebar.write(f"В системе: {hours}ч {minutes}м")
         
@@ -528,23 +611,22 @@ def show_user_info():
 
 def session_timeout_warning():
     """Предупреждение о скором истечении сессии"""
-    if not st.session_state.authenticated or not st.session_state.login_time:
+    elapsed = _session_elapsed()
+    if elapsed is None:
         return
     
-    session_duration = datetime.now() - st.session_state.login_time
-    max_duration = timedelta(minutes=30)
-    remaining = max_duration - session_duration
+    remaining = _SESSION_TIMEOUT_SECONDS - elapsed
     
     # Предупреждаем за 5 минут до истечения
-    if remaining.total_seconds() <= 300 and remaining.total_seconds() > 0:
-        minutes_left = int(remaining.total_seconds() // 60)
+    if 0 < remaining <= _SESSION_WARNING_SECONDS:
+        minutes_left = int(remaining // 60)
         st.warning(f"⏰ Сессия истекает через {minutes_left} минут. Обновите страницу для продления.")
 
 
 def extend_session():
     """Продление сессии"""
     if st.session_state.authenticated:
-        st.session_state.login_time = datetime.now()
+        _start_session_clock()
 
 
 # Автоматическое продление сессии при активности
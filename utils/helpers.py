@@ -4,6 +4,7 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from typing import Any, Dict, List, Optional, Union
@@ -12,11 +13,29 @@ import re
 import logging
 import io
 import base64
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
 # ============== ФОРМАТИРОВАНИЕ ДАННЫХ ==============
 
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """
+    Разбор даты и времени в формате ISO с кэшированием
+    
+    Одинаковые метки времени (например, у массовых начислений)
+    разбираются один раз. Размер кэша ограничен.
+    
+    Args:
+        value: Строка в формате ISO
+        
+    Returns:
+        Объект datetime
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
 def format_phone(phone: str) -> str:
     """
     Форматирование номера телефона
@@ -46,6 +65,9 @@ def format_date(date_value: Union[str, date, datetime], format_type: str = "shor
     """
     Форматирование даты
     
+    Результаты форматов short и long кэшируются; relative зависит
+    от текущей даты и всегда вычисляется заново.
+    
     Args:
         date_value: Дата для форматирования
         format_type: Тип форматирования (short, long, relative)
@@ -53,6 +75,14 @@ def format_date(date_value: Union[str, date, datetime], format_type: str = "shor
     Returns:
         Отформатированная дата
     """
+    if format_type == "relative":
+        return _format_date(date_value, format_type)
+    
+    return _format_date_cached(date_value, format_type)
+
+
+def _format_date(date_value: Union[str, date, datetime], format_type: str) -> str:
+    """Форматирование даты без кэширования (см. format_date)"""
     if not date_value:
         return ""
     
@@ -97,9 +127,13 @@ def format_date(date_value: Union[str, date, datetime], format_type: str = "shor
     return str(date_obj)
 
 
+_format_date_cached = lru_cache(maxsize=2048)(_format_date)
+
+
+@lru_cache(maxsize=2048)
 def format_datetime(datetime_value: Union[str, datetime], format_type: str = "short") -> str:
     """
-    Форматирование даты и времени
+    Форматирование даты и времени (с кэшированием результатов)
     
     Args:
         datetime_value: Дата и время для форматирования
@@ -114,7 +148,7 @@ def format_datetime(datetime_value: Union[str, datetime], format_type: str = "sh
     # Преобразуем к объекту datetime
     if isinstance(datetime_value, str):
         try:
-            dt_obj = datetime.fromisoformat(datetime_value.replace('Z', '+00:00'))
+            dt_obj = _parse_iso(datetime_value)
         except ValueError:
             try:
                 dt_obj = datetime.strptime(datetime_value, '%Y-%m-%d %H:%M:%S')
@@ -438,6 +472,9 @@ def export_dataframe_to_excel(df: pd.DataFrame, sheet_name: str = "Данные"
     """
     Экспорт DataFrame в Excel
     
+    Книга пишется в потоковом режиме openpyxl (write_only): строки
+    сериализуются по мере добавления, без дерева ячеек в памяти.
+    
     Args:
         df: DataFrame для экспорта
         sheet_name: Название листа
@@ -445,14 +482,39 @@ def export_dataframe_to_excel(df: pd.DataFrame, sheet_name: str = "Данные"
     Returns:
         Байты Excel файла
     """
-    output = io.BytesIO()
+    # openpyxl импортируется только при экспорте: модуль helpers
+    # загружается каждой страницей, а Excel нужен редко
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_name)
     
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name=sheet_name, index=False)
+    header = []
+    for column in df.columns:
+        cell = WriteOnlyCell(worksheet, value=str(column))
+        cell.font = Font(bold=True)
+        header.append(cell)
+    worksheet.append(header)
+    
+    # Пропуски (NaN/NaT) записываются пустыми ячейками, как в DataFrame.to_excel
+    values = df.astype(object).where(df.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        worksheet.append(row)
+    
+    output = io.BytesIO()
+    workbook.save(output)
     
     return output.getvalue()
 
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_excel_bytes(df: pd.DataFrame) -> bytes:
+    """Кэшированный Excel-файл: повторные перезапуски не собирают книгу заново"""
+    return export_dataframe_to_excel(df)
+
+
 # ============== ГРАФИКИ И ВИЗУАЛИЗАЦИЯ ==============
 
 def create_pie_chart(data: Dict[str, int], title: str = "Распределение") -> go.Figure:
@@ -543,6 +605,54 @@ def create_line_chart(dates: List[date], values: List[float], title: str = "Ди
     return fig
 
 
+def downsample_lttb(df: pd.DataFrame, x: str, y: str, max_points: int = 2000) -> pd.DataFrame:
+    """
+    Прореживание данных линейного графика алгоритмом LTTB
+    (Largest-Triangle-Three-Buckets) с сохранением формы кривой
+    
+    Args:
+        df: Данные графика, отсортированные по оси X
+        x: Колонка оси X (числа или даты)
+        y: Колонка оси Y
+        max_points: Максимальное количество точек на графике
+        
+    Returns:
+        Исходный DataFrame, если точек не больше max_points, иначе его прореженная копия
+    """
+    n = len(df)
+    if max_points < 3 or n <= max_points:
+        return df
+    
+    x_values = df[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype('datetime64[ns]').astype(np.int64)
+    x_values = x_values.astype(float)
+    y_values = df[y].to_numpy(dtype=float)
+    
+    bucket_size = (n - 2) / (max_points - 2)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    prev = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        
+        # Средняя точка следующей корзины — третья вершина треугольника
+        avg_x = x_values[end:next_end].mean()
+        avg_y = y_values[end:next_end].mean()
+        
+        area = np.abs(
+            (x_values[prev] - avg_x) * (y_values[start:end] - y_values[prev])
+            - (x_values[prev] - x_values[start:end]) * (avg_y - y_values[prev])
+        )
+        prev = start + int(area.argmax())
+        selected[i + 1] = prev
+    
+    return df.iloc[selected]
+
+
 def create_gauge_chart(value: float, title: str = "Показатель", max_value: float = 100) -> go.Figure:
     """
     Создание круглого индикатора
@@ -584,10 +694,17 @@ def create_gauge_chart(value: float, title: str = "Показатель", max_va
 class Paginator:
     """Класс для пагинации данных"""
     
-    def __init__(self, items: List[Any], items_per_page: int = 20):
+    def __init__(self, items: List[Any], items_per_page: int = 20, total_items: Optional[int] = None):
+        """
+        Args:
+            items: Элементы для разбивки на страницы
+            items_per_page: Количество элементов на странице
+            total_items: Общее количество записей, если пагинация выполнена
+                на стороне БД и items содержит только текущую страницу
+        """
         self.items = items
         self.items_per_page = items_per_page
-        self.total_items = len(items)
+        self.total_items = len(items) if total_items is None else total_items
         self.total_pages = (self.total_items + items_per_page - 1) // items_per_page
     
     def get_page(self, page_number: int) -> List[Any]:
@@ -701,6 +818,22 @@ def show_notification(message: str, type_: str = "info", duration: int = 5):
 
 # ============== КЭШИРОВАНИЕ ==============
 
+@st.cache_resource
+def get_database_manager():
+    """
+    Общий экземпляр менеджера БД
+    
+    Создается один раз на процесс и переиспользуется между перезапусками
+    скрипта и сессиями, чтобы не повторять инициализацию схемы.
+    
+    Returns:
+        DatabaseManager: Экземпляр менеджера БД
+    """
+    from config.database import DatabaseManager
+    
+    return DatabaseManager()
+
+
 @st.cache_data(ttl=300)  # Кэш на 5 минут
 def cached_database_query(query: str, params: tuple = None):
     """
@@ -713,9 +846,7 @@ def cached_database_query(query: str, params: tuple = None):
     Returns:
         Результат запроса
     """
-    from config.database import DatabaseManager
-    
-    db = DatabaseManager()
+    db = get_database_manager()
     return db.execute_query(query, params)
 
 
@@ -765,7 +896,7 @@ def create_excel_download_button(data: Union[pd.DataFrame, List[Dict[str, Any]]]
         st.warning("Нет данных для экспорта")
         return
     
-    excel_data = export_dataframe_to_excel(df)
+    excel_data = _cached_excel_bytes(df)
     
     st.download_button(
         label=button_text,
@@ -836,7 +967,7 @@ def get_time_ago(date_time: Union[str, datetime]) -> str:
     """
     if isinstance(date_time, str):
         try:
-            dt = datetime.fromisoformat(date_time.replace('Z', '+00:00'))
+            dt = _parse_iso(date_time)
         except ValueError:
             return str(date_time)
     else: